@@ -61,6 +61,57 @@ class Authorization(object):
         """
         return True
 
+    def is_authorized_many(self, user, operation, resource, items):
+        """Determines authorization to a batch of resource objects.
+
+        By default each object is checked with `is_authorized`; override
+        this to check the batch as a whole.
+
+        @param[in] items
+            The objects that the operation is being performed on
+            (eg. the objects about to be created by a bulk `POST`).
+
+        @returns
+            Returns true to indicate authorization to every object or
+            false to indicate otherwise.
+        """
+        return all(self.is_authorized(user, operation, resource, x)
+                   for x in items)
+
+    def scope(self, user, resource):
+        """Identifies what the user is authorized to read of a resource.
+
+        Cached responses (see the `cache` option of managed resources) are
+        only shared between requests of the same scope. By default each
+        user is their own scope, identified by the class and the primary
+        key (`pk` or `id`) of the user; anonymous users share theirs.
+        Return something coarser (eg. the role of the user) to share
+        responses between users that are authorized to read the same items.
+
+        @param[in] user
+            The user in question that is being checked.
+
+        @param[in] resource
+            The resource instance that is being authorized.
+
+        @returns
+            An object whose `repr` identifies the scope; it must not
+            change between requests (eg. by including a memory address).
+        """
+        if user is None:
+            # Anonymous users are all authorized the same.
+            return None
+
+        for name in ('pk', 'id'):
+            key = getattr(user, name, None)
+            if key is not None:
+                kind = type(user)
+                return '{}.{}'.format(kind.__module__, kind.__name__), key
+
+        raise ImproperlyConfigured(
+            'The user has no primary key to identify the scope of its '
+            'cached responses; override Authorization.scope')
+
     def unauthorized(self):
         """Informs the client that it is not authrozied for the resource."""
         raise http.exceptions.Forbidden()
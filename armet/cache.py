@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Describes the protocol and the included backends of the response cache
+used by managed resources (see the `cache` option).
+"""
+from __future__ import absolute_import, unicode_literals, division
+import os
+import time
+import uuid
+import errno
+import operator
+import hashlib
+import tempfile
+import weakref
+import collections
+from six.moves import cPickle as pickle
+from armet import utils
+from armet.query import parser, QueryGroup
+
+#! Caches that hold the responses of each group; see `register`.
+_registry = collections.defaultdict(weakref.WeakSet)
+
+
+def register(group, cache):
+    """Registers the passed cache as holding responses of the passed group.
+
+    Every cache registered for a group is invalidated when the group
+    changes (see `invalidate`); whichever resource changed it.
+    """
+    _registry[group].add(cache)
+
+
+def invalidate(group):
+    """Discards the responses of the passed group from every cache."""
+    for cache in list(_registry.get(group, ())):
+        cache.invalidate(group)
+
+
+def normalize_query(text):
+    """Normalizes the passed query string for use in a key.
+
+    Queries that only differ in the order of the segments of a group
+    (eg. `a=1&b=2` and `b=2&a=1`) or in duplicate segments are
+    normalized to the same text.
+    """
+    try:
+        query = parser.parse(text)
+
+    except ValueError:
+        # The query string isn't understood; the request fails before
+        # anything is cached.
+        return text
+
+    return _normalize(query.expression)
+
+
+def _normalize(node):
+    if isinstance(node, QueryGroup):
+        # The order (and repetition) of the children of a group
+        # doesn't matter.
+        children = sorted(set(map(_normalize, node.children)))
+        comb = ' & ' if node.combinator == operator.and_ else ' | '
+        return '({})'.format(comb.join(children))
+
+    return repr((node.path, node.operator, node.negated, node.directives,
+                 node.values))
+
+
+class Cache(object):
+    """Establishes the protocol for response caches.
+
+    A backend only has to store and retrieve values (`get`, `set` and
+    `delete`); keys are built and invalidated here. Every key includes
+    the generation of the group of entries it belongs to; invalidating
+    the group starts a new generation so that the entries of the old
+    one are never found again (and are left to be discarded by the
+    backend).
+
+    By default nothing is stored.
+    """
+
+    def __init__(self, timeout=None):
+        #! Number of seconds an entry is retained for; None (the default)
+        #! retains entries until they are invalidated.
+        self.timeout = timeout
+
+    def get(self, key):
+        """Retrieves the value stored at the passed key; None if absent."""
+        return None
+
+    def set(self, key, value):
+        """Stores the passed value at the passed key."""
+
+    def delete(self, key):
+        """Removes the value stored at the passed key, if present."""
+
+    def generation(self, group):
+        """Retrieves the current generation of the passed group."""
+        name = 'generation:{}'.format(group)
+        token = self.get(name)
+        if token is None:
+            # Start a new generation.
+            token = uuid.uuid4().hex
+            self.set(name, token)
+
+        return token
+
+    def key(self, group, *parts):
+        """Builds the key of an entry of the passed group.
+
+        @note
+            The key is built from the current generation of the group;
+            build it before reading what is to be stored so that an
+            invalidation in the meantime discards the entry.
+        """
+        text = repr((group, self.generation(group)) + parts)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def load(self, key):
+        """Retrieves the entry stored at the passed key; None if absent."""
+        value = self.get(key)
+        if value is None:
+            return None
+
+        expires, entry = value
+        if expires is not None and expires < time.time():
+            # The entry has expired.
+            self.delete(key)
+            return None
+
+        return entry
+
+    def store(self, key, entry):
+        """Stores the passed entry at the passed key."""
+        expires = None
+        if self.timeout is not None:
+            expires = time.time() + self.timeout
+
+        self.set(key, (expires, entry))
+
+    def invalidate(self, group):
+        """Discards every entry of the passed group."""
+        self.delete('generation:{}'.format(group))
+
+
+class MemoryCache(Cache):
+    """Retains the entries in the memory of the process.
+
+    The least recently used entries are discarded once more than
+    `maxsize` are retained.
+    """
+
+    def __init__(self, maxsize=1024, **kwargs):
+        super(MemoryCache, self).__init__(**kwargs)
+
+        #! The retained entries.
+        self.entries = utils.LRUCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries.set(key, value)
+
+    def delete(self, key):
+        self.entries.delete(key)
+
+
+class DiskCache(Cache):
+    """Retains the entries as files in a directory.
+
+    The directory may be shared between processes. Entries of old
+    generations aren't removed; clear the directory from time to time.
+    """
+
+    def __init__(self, directory, **kwargs):
+        super(DiskCache, self).__init__(**kwargs)
+
+        #! Path of the directory to store the entries in; it is created
+        #! if it doesn't exist.
+        self.directory = directory
+
+    def _path(self, key):
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as stream:
+                return pickle.load(stream)
+
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            # Not in the cache (or not readable).
+            return None
+
+    def set(self, key, value):
+        try:
+            os.makedirs(self.directory)
+
+        except OSError as ex:
+            if ex.errno != errno.EEXIST:
+                raise
+
+        # Write to a temporary file and move it into place so that
+        # a reader never sees a partial entry.
+        fd, path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as stream:
+            pickle.dump(value, stream, pickle.HIGHEST_PROTOCOL)
+
+        getattr(os, 'replace', os.rename)(path, self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+
+        except OSError as ex:
+            if ex.errno != errno.ENOENT:
+                raise
@@ -4,11 +4,24 @@ import operator
 import six
 from six.moves import map, reduce
 from django.conf import urls
-from django.db.models import Q
+from django.db import connections
+from django.db.models import Q, Max, OneToOneField
+from django.db.models.fields import FieldDoesNotExist
 from django.views.decorators import csrf
 from armet import utils
+from armet.http import exceptions
 from . import http
-from armet.query import parser, Query, QuerySegment, constants
+from armet.query import QueryGroup, constants, optimizer
+
+
+class ModelResourceOptions(object):
+
+    def __init__(self, meta, name, bases):
+        #! Alias of the database (eg. a read replica) to read the models
+        #! from for requests that may be served by a replica (see
+        #! `ModelResource.use_replica`); None reads from the default
+        #! database.
+        self.read_database = meta.get('read_database')
 
 
 class Resource(object):
@@ -57,86 +70,342 @@ OPERATOR_MAP = {
     constants.OPERATOR_GT[0]: '__gt',
     constants.OPERATOR_LTE[0]: '__lte',
     constants.OPERATOR_GTE[0]: '__gte',
+    constants.OPERATOR_REGEX[0]: '__regex',
+    constants.OPERATOR_ISNULL[0]: '__isnull',
+    constants.OPERATOR_IN[0]: '__exact',
 }
 
+#! Database vendors that sort null after every other value; the rest
+#! sort null first.
+NULLS_LARGEST = ('postgresql', 'oracle')
+
+#! Operators that are compiled into a single `__in` lookup when
+#! tested against several values.
+IN_OPERATORS = (
+    constants.OPERATOR_EQUAL[0],
+    constants.OPERATOR_IN[0])
+
+
+def build_segment(segment):
+    # Case doesn't matter to values that aren't text.
+    op = segment.operator
+    if op == constants.OPERATOR_IEQUAL[0] and not any(
+            isinstance(x, six.string_types) for x in segment.values):
+        op = constants.OPERATOR_EQUAL[0]
+
+    path = '__'.join(segment.path)
+    if (op in IN_OPERATORS and len(segment.values) > 1
+            and None not in segment.values):
+        # Test for membership with a single `__in` rather than
+        # a chain of `OR`.
+        q = Q((path + '__in', segment.values))
+
+    else:
+        # Construct a Q-object from each value.
+        path += OPERATOR_MAP[op]
+        q = reduce(operator.or_, map(lambda x: Q((path, x)), segment.values))
+
+    # Apply the negation.
+    return ~q if segment.negated else q
+
+
+def build_clause(expression):
+    if isinstance(expression, QueryGroup):
+        # Combine the Q-objects of each node in the group.
+        return reduce(expression.combinator, map(
+            build_clause, expression.children))
+
+    # Construct a Q-object from the segment.
+    return build_segment(expression)
+
+
+def walk(model, path):
+    """Walks the relations traversed by the path.
+
+    @returns
+        A pair of the names of the relations crossed and whether any of
+        them is to-many (a reverse foreign key or a many-to-many
+        relation); joining through those yields several rows per item.
+    """
+    names = []
+    many = False
+    for name in path:
+        try:
+            field, _, direct, m2m = model._meta.get_field_by_name(name)
+
+        except FieldDoesNotExist:
+            # Not a field; nothing further to walk.
+            break
+
+        if direct and not m2m:
+            if getattr(field, 'rel', None) is None:
+                # A plain field; nothing further to walk.
+                break
+
+            # A foreign key or one-to-one relation.
+            model = field.rel.to
+
+        elif direct:
+            # A many-to-many relation.
+            model = field.rel.to
+            many = True
 
-def build_clause(query, attributes):
-    # Iterate through each query segment.
-    clause = None
-    last = None
-    for seg in query.segments:
-        # Get the attribute in question.
-        attribute = attributes[seg.path[0]]
+        else:
+            # A reverse relation; only a reverse one-to-one relation is
+            # to-one.
+            model = field.model
+            many = many or not isinstance(field.field, OneToOneField)
 
-        # Replace the initial path segment with the expanded
-        # attribute path.
-        seg.path[0:1] = attribute.path.split('.')
+        names.append(name)
 
-        # Boolean's should use `exact` rather than `iexact`.
-        if attribute.type is bool:
-            op = '__exact'
-        else:
-            op = OPERATOR_MAP[seg.operator]
+    return names, many
 
-        # Build the path from the segment.
-        path = '__'.join(seg.path) + op
 
-        # Construct a Q-object from the segment.
-        q = reduce(operator.or_,
-                   map(lambda x: Q((path, x)),
-                       map(attribute.try_clean, seg.values)))
+def crosses_many(model, expression):
+    # Determine if any segment of the expression crosses a to-many
+    # relation.
+    if isinstance(expression, QueryGroup):
+        return any(crosses_many(model, x) for x in expression.children)
 
-        # Combine the segment with the last.
-        clause = last.combinator(clause, q) if last is not None else q
-        last = seg
+    return walk(model, expression.path)[1]
 
-    # Return the constructed clause.
-    return clause
 
+def build_lookup(model, path):
+    """
+    Builds the lookup that loads each relation traversed by the path
+    along with the list.
 
-class ModelResource(object):
+    @returns
+        A pair of the queryset method (`select_related` when the path
+        only follows forward foreign keys and one-to-one relations;
+        otherwise `prefetch_related`) and the lookup; None if the path
+        doesn't cross a relation.
+    """
+    names, many = walk(model, path)
+    if not names:
+        return None
 
-    def filter(self, clause, queryset):
-        # Filter the queryset by the passed clause.
-        return queryset.filter(clause).distinct()
+    method = 'prefetch_related' if many else 'select_related'
+    return method, '__'.join(names)
 
-    def read(self):
+
+def read_chunks(queryset, size, seek, offset=0, limit=None):
+    """
+    Reads the ordered queryset a slice of `size` items at a time; the
+    related items of each slice are prefetched together.
+
+    Each slice seeks past the last item of the one before rather than
+    skipping the items read so far; every slice costs the same and items
+    added or removed in between are neither repeated nor skipped.
+
+    @param[in] seek
+        Callable that builds the Q-object matching the items after the
+        passed item.
+
+    @param[in] offset
+        The number of items to skip at the start of the list.
+
+    @param[in] limit
+        The number of items to read at most; None to read them all.
+    """
+    count = 0
+    remaining = queryset[offset:] if offset else queryset
+    while limit is None or count < limit:
+        # Read the next slice.
+        length = size if limit is None else min(size, limit - count)
+        items = list(remaining[:length])
+        for item in items:
+            yield item
+
+        count += len(items)
+        if len(items) < length:
+            # That was the last slice.
+            break
+
+        # Continue after the last item read.
+        remaining = queryset.filter(seek(items[-1]))
+
+
+class ModelResource(object):
+
+    @classmethod
+    def build_loaders(cls):
+        loaders = {}
+        for name, attribute in six.iteritems(cls.attributes):
+            if attribute.path is None:
+                continue
+
+            # Load the relations that the path walks through.
+            lookup = build_lookup(cls.meta.model, attribute.path.split('.'))
+            if lookup is not None:
+                loaders[name] = lookup
+
+        return loaders
+
+    def relate(self, queryset):
+        if self.request.method == 'HEAD':
+            # Nothing is prepared.
+            return queryset
+
+        # Gather the lookups needed by the requested fields.
+        lookups = {}
+        for name in self.get_fields():
+            if name in self.loaders:
+                method, lookup = self.loaders[name]
+                lookups.setdefault(method, set()).add(lookup)
+
+        # Load the relations along with the list.
+        for method, names in six.iteritems(lookups):
+            queryset = getattr(queryset, method)(*sorted(names))
+
+        return queryset
+
+    def filter(self, clause, queryset, distinct=True):
+        # Filter the queryset by the passed clause; the items are made
+        # distinct unless the clause is known to match each at most once.
+        queryset = queryset.filter(clause)
+        return queryset.distinct() if distinct else queryset
+
+    def project(self, queryset):
+        # Determine the fields needed to prepare the body.
+        names = self.build_projection()
+        if not names:
+            # Load everything.
+            return queryset
+
+        fields = set(x.name for x in self.meta.model._meta.fields)
+        if not names.issubset(fields):
+            # Some attributes aren't fields; we can't tell what they need.
+            return queryset
+
+        # Load only the needed fields; the rest are deferred.
+        return queryset.only(*names)
+
+    def order(self, queryset, stable=False):
+        # Order the queryset as requested.
+        ordering = []
+        for path, descending in self.build_ordering():
+            if walk(self.meta.model, path)[1]:
+                # Each item would be listed once per related item;
+                # a to-many relation can't be sorted by.
+                raise exceptions.BadRequest()
+
+            ordering.append(('-' if descending else '') + '__'.join(path))
+
+        if stable:
+            # Break ties with the primary key so that the list may be
+            # read a slice at a time.
+            ordering.append('pk')
+
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    def paginate(self, queryset):
+        # Order the queryset as requested.
+        queryset = self.order(queryset)
+
+        # Bound the queryset.
+        offset, limit = self.build_bounds()
+        offset = offset or 0
+        if limit is not None:
+            return queryset[offset:offset + limit]
+
+        return queryset[offset:] if offset else queryset
+
+    def select(self, seek=True, operation='read'):
         # Initialize the queryset to the model manager.
         queryset = self.meta.model.objects
-
-        query = None
-        if self.slug is not None:
-            # This is an item-access (eg. GET /<name>/:slug); ignore the
-            # query string and generate a query-object based on the slug.
-            query = Query(segments=[QuerySegment(
-                path=self.meta.slug.path.split('.'),
-                operator=constants.OPERATOR_EQUAL[0],
-                values=[self.slug])])
-
-        elif self.request.query:
-            # This is a list-access; use the query string and construct
-            # a query object from it.
-            query = parser.parse(self.request.query)
+        if self.meta.read_database is not None and self.use_replica():
+            # Read from the replica.
+            queryset = queryset.using(self.meta.read_database)
 
         # Determine if we need to filter the queryset in some way; and if so,
         # filter it.
-        if query is not None:
-            clause = build_clause(query, self.attributes)
-            queryset = self.filter(clause, queryset)
+        expression = self.build_expression(seek=seek)
+        if expression == optimizer.NOTHING:
+            # The query can never match; don't bother asking.
+            return None
+
+        if expression is not None:
+            # Only joins through a to-many relation can match an item
+            # more than once.
+            clause = build_clause(expression)
+            distinct = crosses_many(self.meta.model, expression)
+            queryset = self.filter(clause, queryset, distinct)
 
         # Filter the queryset by asserting authorization.
-        queryset = self.meta.authorization.filter(
-            self.request.user, 'read', self, queryset)
+        return self.meta.authorization.filter(
+            self.request.user, operation, self, queryset)
+
+    def count(self):
+        # Count the items of the list with a single `COUNT(*)`.
+        queryset = self.select(seek=False)
+        return queryset.count() if queryset is not None else 0
+
+    def last_modified(self):
+        queryset = self.select()
+        if queryset is None:
+            # Nothing can match.
+            return None
+
+        # Read the latest modification with a single `SELECT MAX(...)`.
+        path = self.attributes[self.meta.modified_attribute].path
+        result = queryset.aggregate(value=Max(path.replace('.', '__')))
+        return result['value']
+
+    def iterate(self):
+        # Select the items that are requested.
+        queryset = self.select()
+        if queryset is None:
+            # Nothing can match.
+            return iter(())
+
+        # Load only what is needed and order the list.
+        queryset = self.relate(self.project(queryset))
+        queryset = self.order(queryset.all(), stable=True)
+
+        # Each chunk continues after the keys of the last item read.
+        keys = self.build_ordering() + [(('pk',), False)]
+        nulls = connections[queryset.db].vendor in NULLS_LARGEST
+
+        def seek(item):
+            paths = []
+            for path, descending in keys:
+                value = item
+                for name in path:
+                    value = getattr(value, name, None)
+
+                paths.append((path, descending, value))
+
+            return build_clause(self.build_keyset(paths, nulls))
+
+        # Read the bounded list a chunk at a time.
+        offset, limit = self.build_bounds()
+        return read_chunks(
+            queryset, self.meta.chunk_size, seek, offset or 0, limit)
+
+    def read(self):
+        # Select the items that are requested.
+        queryset = self.select()
+        if queryset is None:
+            # Nothing can match.
+            return [] if self.slug is None else None
+
+        # Load only what is needed (along with its relations).
+        queryset = self.relate(self.project(queryset))
 
         if self.slug is not None:
             # Attempt to return just the single result we should have.
             result = queryset.all()[:1]
             return result[0] if result else None
 
-        # Return the entire queryset.
-        return list(queryset.all())
+        # Order and bound the list.
+        items = list(self.paginate(queryset.all()))
 
-    def create(self, data):
+        # Link to the next page and return the items.
+        self.link_next_page(items)
+        return items
+
+    def construct(self, data):
         # Instantiate a new target.
         target = self.meta.model()
 
@@ -147,6 +416,12 @@ class ModelResource(object):
             if value is not None:
                 attribute.set(target, value)
 
+        return target
+
+    def create(self, data):
+        # Instantiate a new target.
+        target = self.construct(data)
+
         # Ensure the user is authorized to perform this action.
         authz = self.meta.authorization
         if not authz.is_authorized(self.request.user, 'create', self, target):
@@ -158,19 +433,80 @@ class ModelResource(object):
         # Return the target.
         return target
 
+    def create_many(self, data):
+        # Instantiate each target.
+        targets = [self.construct(x) for x in data]
+
+        # Ensure the user is authorized to perform this action.
+        authz = self.meta.authorization
+        if not authz.is_authorized_many(
+                self.request.user, 'create', self, targets):
+            authz.unauthorized()
+
+        # Insert the targets with a single query.
+        self.meta.model.objects.bulk_create(targets)
+
+        # Return the targets.
+        return targets
+
     def update(self, target, data):
-        # Iterate through all attributes and set each one.
-        for name, attribute in six.iteritems(self.attributes):
-            # Set each one on the target.
-            attribute.set(target, data.get(name))
+        # Iterate through the passed attributes and set each one.
+        changed = []
+        for name, value in six.iteritems(data):
+            attribute = self.attributes[name]
+            if utils.differs(attribute.get(target), value):
+                # Set each one that changed on the target.
+                attribute.set(target, value)
+                changed.append(attribute.path)
 
         # Ensure the user is authorized to perform this action.
         authz = self.meta.authorization
         if not authz.is_authorized(self.request.user, 'update', self, target):
             authz.unauthorized()
 
-        # Save the target.
-        target.save()
+        if not changed:
+            # Nothing to save.
+            return
+
+        fields = set(x.name for x in self.meta.model._meta.fields)
+        if fields.issuperset(changed):
+            # Save just the fields that changed.
+            target.save(update_fields=changed)
+
+        else:
+            # Some attributes aren't fields; save the whole target.
+            target.save()
+
+    def update_many(self, data):
+        # Resolve the field of each value.
+        values = {}
+        fields = set(x.name for x in self.meta.model._meta.fields)
+        for name, value in six.iteritems(data):
+            attribute = self.attributes[name]
+            if attribute.path not in fields:
+                # Only fields of the model can be set in bulk.
+                raise exceptions.BadRequest({attribute.name: [
+                    'Attribute can\'t be updated in bulk.']})
+
+            values[attribute.path] = value
+
+        queryset = self.select(seek=False, operation='update')
+        if queryset is None or not values:
+            # Nothing to update.
+            return 0
+
+        # Update every item with a single `UPDATE ... WHERE`.
+        return queryset.all().update(**values)
+
+    def destroy_many(self):
+        queryset = self.select(seek=False, operation='destroy')
+        if queryset is None:
+            # Nothing to destroy.
+            return
+
+        # Destroy every item; this is a single `DELETE ... WHERE` unless
+        # deletions cascade or are observed by signals.
+        queryset.all().delete()
 
     def destroy(self):
         # Grab the existing target.
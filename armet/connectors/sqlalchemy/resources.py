@@ -1,33 +1,142 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
+import re
 import six
+import datetime
+import types
 import operator
+import collections
+import sqlalchemy as sa
+from sqlalchemy import orm
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
 from functools import partial
 from six.moves import map, reduce
 from armet.exceptions import ImproperlyConfigured
-from armet.query import parser, Query, QuerySegment, constants
-from armet import utils
+from armet.query import QueryGroup, constants, optimizer
+from armet import utils, http
+
+
+#! Session factories constructed from the options; shared between the
+#! resources that are configured the same way.
+_factories = {}
+
+
+def _factory(kind, *args, **kwargs):
+    # Construct each factory only once so that, eg., every resource
+    # of a thread reuses the same scoped session.
+    key = (kind,) + args + tuple(sorted(kwargs.items()))
+    factory = _factories.get(key)
+    if factory is None:
+        _factories[key] = factory = kind(*args, **kwargs)
+
+    return factory
 
 
 class ModelResourceOptions(object):
 
     def __init__(self, meta, name, bases):
+        #! SQLAlchemy engine (and its connection pool) to use when no
+        #! session factory is given; a session factory bound to the
+        #! engine is constructed.
+        self.engine = meta.get('engine')
+
         #! SQLAlchemy session used to perform operations on the models.
         self.Session = meta.get('Session')
+        if not self.Session and self.engine is not None:
+            self.Session = _factory(orm.sessionmaker, bind=self.engine)
+
         if not self.Session:
             raise ImproperlyConfigured(
-                'A session factory (via sessionmaker) is required by '
-                'the SQLAlchemy model connector.')
+                'A session factory (via sessionmaker) or an engine is '
+                'required by the SQLAlchemy model connector.')
+
+        #! SQLAlchemy engine of a read replica to use when no read session
+        #! factory is given; a session factory bound to the engine is
+        #! constructed.
+        self.read_engine = meta.get('read_engine')
+
+        #! SQLAlchemy session used to read the models (eg. bound to
+        #! a read replica) for requests that may be served by a replica
+        #! (see `ModelResource.use_replica`); None reads with `Session`.
+        self.ReadSession = meta.get('ReadSession')
+        if not self.ReadSession and self.read_engine is not None:
+            self.ReadSession = _factory(
+                orm.sessionmaker, bind=self.read_engine)
+
+        #! Whether each thread reuses the same session between requests
+        #! (via scoped_session) rather than constructing a new session
+        #! for every request.
+        self.scoped_session = meta.get('scoped_session', False)
+        if self.scoped_session:
+            if not isinstance(self.Session, orm.scoped_session):
+                self.Session = _factory(orm.scoped_session, self.Session)
+
+            if self.ReadSession and not isinstance(
+                    self.ReadSession, orm.scoped_session):
+                self.ReadSession = _factory(
+                    orm.scoped_session, self.ReadSession)
 
 
 def iequal_helper(x, y):
-    # String values should use ILIKE queries.
-    if isinstance(type(y), six.string_types):
-        return x.ilike(y)
+    # String values should be compared without regard to case.
+    if isinstance(y, six.string_types):
+        return sa.func.lower(x) == y.lower()
     else:
         return operator.eq(x, y)
 
 
+def isnull_helper(x, y):
+    # Test for (or against) null.
+    return x.is_(None) if y else x.isnot(None)
+
+
+#! Dialects that can match against a regular expression; mapped to the
+#! format of the test.
+REGEX_FORMATS = {
+    'sqlite': '({} REGEXP {})',
+    'mysql': '({} REGEXP {})',
+    'postgresql': '({} ~ {})',
+    'oracle': 'REGEXP_LIKE({}, {})',
+}
+
+
+class RegexMatch(ColumnElement):
+    """Matches an expression against a regular expression.
+
+    This is compiled to the test that the dialect of the connection
+    understands (see `REGEX_FORMATS`).
+    """
+
+    type = sa.Boolean()
+
+    #! The operands aren't described to the statement cache; statements
+    #! that match against a regular expression aren't cached.
+    inherit_cache = False
+
+    def __init__(self, operand, pattern):
+        self.operand = operand
+        self.pattern = sa.literal(pattern)
+
+
+@compiles(RegexMatch)
+def compile_regex_match(element, compiler, **kwargs):
+    name = compiler.dialect.name
+    if name not in REGEX_FORMATS:
+        raise CompileError(
+            'Regular expressions are not supported by {}.'.format(name))
+
+    return REGEX_FORMATS[name].format(
+        compiler.process(element.operand, **kwargs),
+        compiler.process(element.pattern, **kwargs))
+
+
+def regex_helper(x, y):
+    # Match against the regular expression.
+    return RegexMatch(x, y)
+
+
 # Build an operator map to use for sqlalchemy.
 OPERATOR_MAP = {
     constants.OPERATOR_EQUAL[0]: operator.eq,
@@ -36,49 +145,264 @@ OPERATOR_MAP = {
     constants.OPERATOR_GT[0]: operator.gt,
     constants.OPERATOR_LTE[0]: operator.le,
     constants.OPERATOR_GTE[0]: operator.ge,
+    constants.OPERATOR_REGEX[0]: regex_helper,
+    constants.OPERATOR_ISNULL[0]: isnull_helper,
+    constants.OPERATOR_IN[0]: operator.eq,
 }
 
+#! Operators that are compiled into a single `IN` predicate when
+#! tested against several values.
+IN_OPERATORS = (
+    constants.OPERATOR_EQUAL[0],
+    constants.OPERATOR_IN[0])
+
+
+def build_predicate(col, op, values):
+    # Determine which of the values are text.
+    text = [isinstance(x, six.string_types) for x in values]
+    if op == constants.OPERATOR_IEQUAL[0] and not any(text):
+        # Case doesn't matter to values that aren't text.
+        op = constants.OPERATOR_EQUAL[0]
+
+    if len(values) > 1 and None not in values:
+        # Test for membership with a single `IN` rather than
+        # a chain of `OR`.
+        if op in IN_OPERATORS:
+            return col.in_(values)
+
+        if op == constants.OPERATOR_IEQUAL[0] and all(text):
+            return sa.func.lower(col).in_([x.lower() for x in values])
+
+    # Apply the operator to each value and combine the expressions.
+    return reduce(operator.or_, map(partial(OPERATOR_MAP[op], col), values))
+
+
+def joinable(segment):
+    """
+    Determines if the segment may test its relationships through joins.
+
+    Negated and null tests keep to semi-joins; through an (outer) join
+    they would match (or fail to match) items that have no related
+    item at all.
+    """
+    return not segment.negated and (
+        segment.operator != constants.OPERATOR_ISNULL[0])
+
+
+def plan_joins(model, expression, joins):
+    """
+    Plans the joins needed to test the expression. Each scalar (to-one)
+    relationship walked by a segment is joined once, through an alias,
+    however many segments walk it; collections are left to semi-joins
+    (`EXISTS`) so that an item never matches twice.
+
+    @param[in] joins
+        Ordered dictionary of relationship paths (as tuples) to the
+        alias that the relationship is joined through; updated in place.
+    """
+    if isinstance(expression, QueryGroup):
+        # Plan the joins of each node in the group.
+        for node in expression.children:
+            plan_joins(model, node, joins)
+
+        return
+
+    if not joinable(expression):
+        return
+
+    entity = model
+    path = expression.path
+    for index, name in enumerate(path[:-1]):
+        relationship = sa.inspect(entity).mapper.relationships.get(name)
+        if relationship is None or relationship.uselist:
+            # Not a scalar relationship; tested by a semi-join from here.
+            break
+
+        key = path[:index + 1]
+        if key not in joins:
+            # Join the relationship through an alias of its own.
+            joins[key] = orm.aliased(relationship.mapper.class_)
+
+        entity = joins[key]
+
+
+def apply_joins(queryset, model, joins):
+    # Outer join each planned relationship to its parent so that items
+    # without a related item still match other parts of the expression.
+    for path, alias in six.iteritems(joins):
+        parent = joins.get(path[:-1], model)
+        queryset = queryset.outerjoin(alias, getattr(parent, path[-1]))
+
+    return queryset
+
+
+def build_segment(entity, segment, path, joins=None, prefix=()):
+    if len(path) > 1:
+        key = prefix + path[:1]
+        if joins and joinable(segment) and key in joins:
+            # Continue from the alias the relationship is joined through.
+            return build_segment(
+                joins[key], segment, path[1:], joins, key)
+
+        # Resolve the inner-most path segment through a semi-join
+        # (`EXISTS`); `has` for a scalar and `any` for a collection.
+        col = getattr(entity, path[0])
+        test = col.any if col.property.uselist else col.has
+        return test(build_segment(
+            col.property.mapper.class_, segment, path[1:]))
+
+    # Construct the clause from the operator and values.
+    col = getattr(entity, path[0])
+    clause = build_predicate(col, segment.operator, segment.values)
+
+    # Apply the negation.
+    return sa.not_(clause) if segment.negated else clause
+
+
+def build_clause(expression, model, joins=None):
+    if isinstance(expression, QueryGroup):
+        # Combine the clauses of each node in the group.
+        return reduce(expression.combinator, (
+            build_clause(node, model, joins)
+            for node in expression.children))
+
+    # Construct the clause from the segment.
+    return build_segment(model, expression, expression.path, joins)
+
+
+def uses_operator(expression, op):
+    # Determine if any segment of the expression uses the operator.
+    if isinstance(expression, QueryGroup):
+        return any(uses_operator(x, op) for x in expression.children)
+
+    return expression.operator == op
+
+
+#! Strategy used to load a collection; `selectinload` is preferred
+#! where the installed SQLAlchemy has it.
+_collection_loader = getattr(orm, 'selectinload', orm.subqueryload)
+
+
+def build_loader(model, path):
+    """
+    Builds the loader option that eagerly loads each relationship
+    traversed by the path; None if the path doesn't cross one.
+
+    Scalar relationships are joined into the query; collections are
+    loaded by a single further query.
+    """
+    loader = None
+    for name in path:
+        relationship = sa.inspect(model).relationships.get(name)
+        if relationship is None:
+            # Not a relationship; nothing further to load.
+            break
+
+        # Chain the loader of the relationship.
+        strategy = _collection_loader if relationship.uselist else (
+            orm.joinedload)
+
+        attribute = getattr(model, name)
+        loader = strategy(attribute) if loader is None else (
+            getattr(loader, strategy.__name__)(attribute))
+
+        model = relationship.mapper.class_
+
+    return loader
+
+
+class _UTC(datetime.tzinfo):
+    """Coordinated Universal Time; naive values are taken to be in it.
+    """
+
+    def utcoffset(self, value):
+        return datetime.timedelta(0)
+
+    def dst(self, value):
+        return datetime.timedelta(0)
+
+    def tzname(self, value):
+        return 'UTC'
+
+
+def coerce_value(model, path, value):
+    """
+    Converts a date/time to the form (naive or aware) that the column
+    addressed by the path stores.
+
+    Naive and aware date/times can't be compared; the session compares
+    the new value of an attribute with its loaded value when it is
+    flushed. Aware values are stored in UTC in naive columns and naive
+    values are taken to be in UTC in aware columns.
+    """
+    if not isinstance(value, datetime.datetime) or path is None:
+        return value
+
+    # Resolve the column through the relationships of the path.
+    mapper = sa.inspect(model)
+    names = path.split('.')
+    for name in names[:-1]:
+        relationship = mapper.relationships.get(name)
+        if relationship is None:
+            # Not addressable through the model; leave it be.
+            return value
 
-def build_segment(model, segment, attr):
-    # Get the associated column for the initial path.
-    path = segment.path.pop(0)
-    col = model.__dict__[path]
+        mapper = relationship.mapper
 
-    # Resolve the inner-most path segment.
-    if segment.path:
-        return col.has(build_segment(
-            col.property.mapper.class_, segment, attr))
+    prop = mapper.column_attrs.get(names[-1])
+    if prop is None or not isinstance(prop.columns[0].type, sa.DateTime):
+        return value
 
-    # Determine the operator.
-    op = OPERATOR_MAP[segment.operator]
+    aware = value.tzinfo is not None and value.utcoffset() is not None
+    if prop.columns[0].type.timezone:
+        return value if aware else value.replace(tzinfo=_UTC())
 
-    # Apply the operator to the values and return the expression
-    return reduce(operator.or_,
-                  map(partial(op, col),
-                      map(attr.try_clean, segment.values)))
+    if aware:
+        return (value - value.utcoffset()).replace(tzinfo=None)
 
+    return value
 
-def build_clause(query, attributes, model):
-    # Iterate through each query segment.
-    clause = None
-    last = None
-    for seg in query.segments:
-        # Get the attribute in question.
-        attribute = attributes[seg.path[0]]
 
-        # Replace the initial path segment with the expanded
-        # attribute path.
-        seg.path[0:1] = attribute.path.split('.')
+def regexp(pattern, value):
+    """Implements the `REGEXP` operator for SQLite.
 
-        # Construct the clause from the segment.
-        q = build_segment(model, seg, attribute)
+    @note
+        SQLite understands `x REGEXP y` but leaves the implementation
+        of the `regexp(y, x)` function to the application.
+    """
+    if value is None:
+        return False
+
+    return re.search(pattern, six.text_type(value)) is not None
+
+
+def transact(session, iterator, readonly=False):
+    """
+    Iterates through a streamed response and then commits (unless the
+    transaction is read-only) and closes the session that the response
+    reads from.
+    """
+    try:
+        # Continue on with the stream.
+        for chunk in iterator:
+            yield chunk
+
+        if not readonly:
+            # Commit the session.
+            session.commit()
+
+    except:
+        if not readonly:
+            # Something occurred (or the client went away); rollback the
+            # session.
+            session.rollback()
 
-        # Combine the segment with the last.
-        clause = last.combinator(clause, q) if last is not None else q
-        last = seg
+        # Re-raise the exception.
+        raise
 
-    # Return the constructed clause.
-    return clause
+    finally:
+        # Close the session.
+        session.close()
 
 
 class ModelResource(object):
@@ -90,67 +414,242 @@ class ModelResource(object):
     """
 
     def route(self, *args, **kwargs):
-        # Establish a session.
-        self.session = session = self.meta.Session()
+        # Establish a session; reading from the replica if we may.
+        Session = self.meta.Session
+        if self.meta.ReadSession is not None and self.use_replica():
+            Session = self.meta.ReadSession
+
+        self.session = session = Session()
+        streaming = False
+
+        # Safe methods are run in a read-only transaction; nothing is
+        # flushed and the transaction is simply discarded (closing the
+        # session rolls it back without expiring anything) rather than
+        # committed.
+        readonly = self.request.method in http.SAFE_METHODS
+        session.autoflush = not readonly
 
         try:
             # Continue on with the cycle.
             result = utils.super(ModelResource, self).route(*args, **kwargs)
 
-            # Commit the session.
-            session.commit()
+            if isinstance(result, types.GeneratorType):
+                # The response is streamed and reads from the session as
+                # it goes; the stream takes over the session.
+                streaming = True
+                return transact(session, result, readonly)
+
+            if not readonly:
+                # Commit the session.
+                session.commit()
 
             # Return the result.
             return result
 
         except:
-            # Something occurred; rollback the session.
-            session.rollback()
+            if not readonly:
+                # Something occurred; rollback the session.
+                session.rollback()
 
             # Re-raise the exception.
             raise
 
         finally:
-            # Close the session.
-            session.close()
-
-    def filter(self, clause, queryset):
-        # Filter the queryset by the passed clause.
-        return queryset.filter(clause).distinct()
-
-    def read(self):
+            if not streaming:
+                # Close the session.
+                session.close()
+
+    def filter(self, clause, queryset, distinct=True):
+        # Filter the queryset by the passed clause; the items are made
+        # distinct unless the clause is known to match each at most once.
+        queryset = queryset.filter(clause)
+        return queryset.distinct() if distinct else queryset
+
+    def project(self, queryset):
+        # Determine the columns needed to prepare the body.
+        names = self.build_projection()
+        if not names:
+            # Load everything.
+            return queryset
+
+        # Relationships are loaded separately (see `relate`).
+        mapper = sa.inspect(self.meta.model)
+        names = [x for x in names if x not in mapper.relationships]
+        if not all(name in mapper.column_attrs for name in names):
+            # Some attributes aren't columns; we can't tell what they need.
+            return queryset
+
+        # Load only the needed columns; the rest are deferred.
+        return queryset.options(orm.load_only(*(
+            getattr(self.meta.model, name) for name in names)))
+
+    @classmethod
+    def build_loaders(cls):
+        loaders = {}
+        for name, attribute in six.iteritems(cls.attributes):
+            if attribute.path is None:
+                continue
+
+            # Load the relationships that the path walks through.
+            loader = build_loader(cls.meta.model, attribute.path.split('.'))
+            if loader is not None:
+                loaders[name] = loader
+
+        return loaders
+
+    def relate(self, queryset):
+        if self.request.method == 'HEAD':
+            # Nothing is prepared.
+            return queryset
+
+        # Eagerly load the relationships needed by the requested fields.
+        loaders = [self.loaders[x] for x in self.get_fields()
+                   if x in self.loaders]
+
+        return queryset.options(*loaders) if loaders else queryset
+
+    def join(self, queryset, path, many=False):
+        """
+        Joins through to the model of the inner-most path segment; reusing
+        the joins made by the filter.
+
+        @param[in] many
+            Whether the path may cross a collection; each item is then
+            joined once per related item.
+
+        @returns
+            A pair of the queryset and the column the path ends at.
+        """
+        joins = self.joins
+        entity = self.meta.model
+        for index, name in enumerate(path[:-1]):
+            relationship = getattr(entity, name)
+            if relationship.property.uselist and not many:
+                # Each item would be listed once per related item.
+                raise http.exceptions.BadRequest()
+
+            key = path[:index + 1]
+            if key not in joins:
+                joins[key] = orm.aliased(relationship.property.mapper.class_)
+                queryset = queryset.outerjoin(joins[key], relationship)
+
+            entity = joins[key]
+
+        return queryset, getattr(entity, path[-1])
+
+    def paginate(self, queryset):
+        # Order the queryset as requested; a collection can't be sorted by.
+        for path, descending in self.build_ordering():
+            queryset, col = self.join(queryset, path)
+            queryset = queryset.order_by(col.desc() if descending else col)
+
+        # Bound the queryset.
+        offset, limit = self.build_bounds()
+        if offset:
+            queryset = queryset.offset(offset)
+
+        if limit is not None:
+            queryset = queryset.limit(limit)
+
+        return queryset
+
+    def register_regexp(self):
+        connection = self.session.connection()
+        if connection.dialect.name not in REGEX_FORMATS:
+            # The database can't match against a regular expression.
+            raise http.exceptions.BadRequest(
+                'Regular expressions are not supported.')
+
+        # Register the `regexp` function on SQLite connections.
+        if connection.dialect.name == 'sqlite':
+            connection.connection.create_function('regexp', 2, regexp)
+
+    def select(self, seek=True, operation='read'):
         # Initialize the query to the model.
         queryset = self.session.query(self.meta.model)
 
-        query = None
-        if self.slug is not None:
-            # This is an item-access (eg. GET /<name>/:slug); ignore the
-            # query string and generate a query-object based on the slug.
-            query = Query(segments=[QuerySegment(
-                path=self.meta.slug.path.split('.'),
-                operator=constants.OPERATOR_EQUAL[0],
-                values=[self.slug])])
-
-        elif self.request.query:
-            # This is a list-access; use the query string and construct
-            # a query object from it.
-            query = parser.parse(self.request.query)
+        #! Relationships joined into the query; see `plan_joins`.
+        self.joins = collections.OrderedDict()
 
         # Determine if we need to filter the queryset in some way; and if so,
         # filter it.
-        clause = None
-        if query is not None:
-            clause = build_clause(query, self.attributes, self.meta.model)
-            queryset = self.filter(clause, queryset)
+        expression = self.build_expression(seek=seek)
+        if expression == optimizer.NOTHING:
+            # The query can never match; don't bother asking.
+            return None
+
+        if expression is not None:
+            if uses_operator(expression, constants.OPERATOR_REGEX[0]):
+                # Regular expressions need a database that understands
+                # them (and an implementation of `REGEXP` on SQLite).
+                self.register_regexp()
+
+            # Join the scalar relationships that the expression tests.
+            plan_joins(self.meta.model, expression, self.joins)
+            queryset = apply_joins(queryset, self.meta.model, self.joins)
+
+            # The clause only joins scalar relationships and tests
+            # collections through semi-joins; each item is matched at
+            # most once.
+            clause = build_clause(expression, self.meta.model, self.joins)
+            queryset = self.filter(clause, queryset, distinct=False)
 
         # Filter the queryset by asserting authorization.
-        queryset = self.meta.authorization.filter(
-            self.request.user, 'read', self, queryset)
+        return self.meta.authorization.filter(
+            self.request.user, operation, self, queryset)
+
+    def count(self):
+        # Count the items of the list with a single `COUNT(*)`.
+        queryset = self.select(seek=False)
+        return queryset.count() if queryset is not None else 0
+
+    def last_modified(self):
+        queryset = self.select()
+        if queryset is None:
+            # Nothing can match.
+            return None
+
+        # Read the latest modification with a single `SELECT MAX(...)`;
+        # the latest of the related items of a collection is as good.
+        attribute = self.attributes[self.meta.modified_attribute]
+        path = tuple(attribute.path.split('.'))
+        queryset, column = self.join(queryset, path, many=True)
+        return queryset.with_entities(sa.func.max(column)).scalar()
+
+    def iterate(self):
+        # Select the items that are requested.
+        queryset = self.select()
+        if queryset is None:
+            # Nothing can match.
+            return iter(())
+
+        # Load only what is needed, order and bound the list, and read it
+        # a chunk at a time.
+        queryset = self.paginate(self.relate(self.project(queryset)))
+        return queryset.yield_per(self.meta.chunk_size)
 
-        # Return the queryset.
-        return queryset.all() if self.slug is None else queryset.first()
+    def read(self):
+        # Select the items that are requested.
+        queryset = self.select()
+        if queryset is None:
+            # Nothing can match.
+            return [] if self.slug is None else None
 
-    def create(self, data):
+        # Load only what is needed (along with its relationships).
+        queryset = self.relate(self.project(queryset))
+
+        if self.slug is not None:
+            # Return the single item.
+            return queryset.first()
+
+        # Order and bound the list.
+        items = self.paginate(queryset).all()
+
+        # Link to the next page and return the items.
+        self.link_next_page(items)
+        return items
+
+    def construct(self, data):
         # Instantiate a new target.
         target = self.meta.model()
 
@@ -159,7 +658,14 @@ class ModelResource(object):
             # Set each one on the target.
             value = data.get(name)
             if value is not None:
-                attribute.set(target, value)
+                attribute.set(target, coerce_value(
+                    self.meta.model, attribute.path, value))
+
+        return target
+
+    def create(self, data):
+        # Instantiate a new target.
+        target = self.construct(data)
 
         # Ensure the user is authorized to perform this action.
         authz = self.meta.authorization
@@ -173,11 +679,32 @@ class ModelResource(object):
         # Return the target.
         return target
 
+    def create_many(self, data):
+        # Instantiate each target.
+        targets = [self.construct(x) for x in data]
+
+        # Ensure the user is authorized to perform this action.
+        authz = self.meta.authorization
+        if not authz.is_authorized_many(
+                self.request.user, 'create', self, targets):
+            authz.unauthorized()
+
+        # Add the targets to the session and insert them with
+        # a single flush.
+        self.session.add_all(targets)
+        self.session.flush()
+
+        # Return the targets.
+        return targets
+
     def update(self, target, data):
-        # Iterate through all attributes and set each one.
-        for name, attribute in six.iteritems(self.attributes):
-            # Set each one on the target.
-            attribute.set(target, data.get(name))
+        # Iterate through the passed attributes and set each one.
+        for name, value in six.iteritems(data):
+            attribute = self.attributes[name]
+            value = coerce_value(self.meta.model, attribute.path, value)
+            if utils.differs(attribute.get(target), value):
+                # Set each one that changed on the target.
+                attribute.set(target, value)
 
         # Ensure the user is authorized to perform this action.
         authz = self.meta.authorization
@@ -187,6 +714,57 @@ class ModelResource(object):
         # Flush the target and expire attributes.
         self.session.flush()
 
+    def select_many(self, operation):
+        # Select the items of the list that the operation may be performed
+        # on; None if nothing can match.
+        queryset = self.select(seek=False, operation=operation)
+        if queryset is None:
+            return None
+
+        if not self.joins:
+            # The selection only filters the model; the statement is
+            # issued against it directly.
+            return queryset
+
+        # Address the items by their primary key; the statement can't
+        # be issued against a selection that joins other tables.
+        model = self.meta.model
+        keys = sa.inspect(model).primary_key
+        key = keys[0] if len(keys) == 1 else sa.tuple_(*keys)
+        return self.session.query(model).filter(
+            key.in_(queryset.with_entities(*keys)))
+
+    def update_many(self, data):
+        # Resolve the column of each value.
+        values = {}
+        columns = sa.inspect(self.meta.model).column_attrs
+        for name, value in six.iteritems(data):
+            attribute = self.attributes[name]
+            if attribute.path not in columns:
+                # Only columns of the model can be set in bulk.
+                raise http.exceptions.BadRequest({attribute.name: [
+                    'Attribute can\'t be updated in bulk.']})
+
+            values[getattr(self.meta.model, attribute.path)] = coerce_value(
+                self.meta.model, attribute.path, value)
+
+        queryset = self.select_many('update')
+        if queryset is None or not values:
+            # Nothing to update.
+            return 0
+
+        # Update every item with a single `UPDATE ... WHERE`.
+        return queryset.update(values, synchronize_session=False)
+
+    def destroy_many(self):
+        queryset = self.select_many('destroy')
+        if queryset is None:
+            # Nothing to destroy.
+            return
+
+        # Destroy every item with a single `DELETE ... WHERE`.
+        queryset.delete(synchronize_session=False)
+
     def destroy(self):
         # Grab the existing target.
         target = self.read()
@@ -5,15 +5,25 @@ from __future__ import absolute_import, unicode_literals, division
 from six.moves import http_client as client
 from .request import Request
 from .response import Response
-from . import exceptions
+from . import exceptions, compression
+from .dates import timestamp, format_date, parse_date
 
 __all__ = [
     'client',
     'Request',
     'Response',
-    'exceptions'
+    'exceptions',
+    'compression',
+    'timestamp',
+    'format_date',
+    'parse_date',
+    'SAFE_METHODS'
 ]
 
+#! HTTP/1.1 methods that are safe; they don't change anything on
+#! the server.
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
 try:
     # Attempt to get additional status codes (added in python 3.2)
     getattr(client, 'PERMANENT_REDIRECT')
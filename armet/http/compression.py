@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Negotiates and applies the content coding of response bodies.
+"""
+from __future__ import absolute_import, unicode_literals, division
+import zlib
+
+#! Content codings that bodies may be compressed with; mapped to the
+#! window bits that select their format (a gzip or a zlib stream).
+CODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+#! Names of the content codings that are equivalent to another.
+ALIASES = {'x-gzip': 'gzip'}
+
+
+def parse(text):
+    """Parses an `Accept-Encoding` header.
+
+    @returns
+        A dictionary mapping the named codings to their quality.
+    """
+    weights = {}
+    for item in (text or '').split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        # Read the quality of the coding; it defaults to 1.
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+
+                except ValueError:
+                    # A quality we can't understand isn't acceptable.
+                    quality = 0.0
+
+        weights[ALIASES.get(name, name)] = quality
+
+    return weights
+
+
+def negotiate(text, codings):
+    """Determines the content coding to use from an `Accept-Encoding` header.
+
+    @param[in] text
+        The value of the `Accept-Encoding` header; None if absent.
+
+    @param[in] codings
+        The codings that may be used, in order of preference.
+
+    @returns
+        The name of the coding to use; None if the body should be sent
+        as is.
+    """
+    weights = parse(text)
+    if not weights:
+        # The client didn't ask for anything.
+        return None
+
+    chosen, best = None, 0
+    for coding in codings:
+        quality = weights.get(coding, weights.get('*', 0))
+        if quality > best:
+            chosen, best = coding, quality
+
+    return chosen
+
+
+def compressor(coding, level=6):
+    """Constructs an incremental compressor for the passed coding.
+
+    @param[in] coding
+        The name of the content coding (one of `CODINGS`).
+
+    @param[in] level
+        The compression level from 1 (fastest) to 9 (smallest).
+    """
+    return zlib.compressobj(level, zlib.DEFLATED, CODINGS[coding])
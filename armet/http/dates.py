@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Converts between date/times and the HTTP-date format of RFC 2616.
+"""
+from __future__ import absolute_import, unicode_literals, division
+import calendar
+from email.utils import formatdate, parsedate_tz, mktime_tz
+
+
+def timestamp(value):
+    """Converts the passed date/time to seconds since the epoch.
+
+    @note
+        A naive date/time is taken to be in UTC.
+    """
+    return calendar.timegm(value.utctimetuple())
+
+
+def format_date(seconds):
+    """
+    Formats the passed seconds since the epoch as an HTTP-date
+    (eg. `Wed, 01 May 2013 12:00:00 GMT`).
+    """
+    return formatdate(seconds, usegmt=True)
+
+
+def parse_date(text):
+    """Parses the passed HTTP-date.
+
+    @returns
+        The seconds since the epoch; None if the text isn't a date.
+    """
+    parsed = parsedate_tz(text or '')
+    if parsed is None:
+        # Not a date; the header is ignored.
+        return None
+
+    return mktime_tz(parsed)
@@ -6,8 +6,9 @@ import six
 import mimeparse
 import weakref
 import io
+import zlib
 from armet import exceptions
-from . import request, client
+from . import request, client, compression
 
 
 class Headers(collections.MutableMapping, request.Headers):
@@ -162,6 +163,13 @@ class Response(object):
         #! The content chunk to return to the client.
         self._body = None
 
+        #! True once the content coding of the body has been determined.
+        self._negotiated = False
+
+        #! Incremental compressor of a streamed body; None if the body
+        #! isn't compressed as it is streamed.
+        self._compressor = None
+
     def require_not_closed(self):
         """Raises an exception if the response is closed."""
         if self.closed:
@@ -248,15 +256,28 @@ class Response(object):
         # Ensure we're not closed.
         self.require_not_closed()
 
-        if not self.streaming or self.asynchronous:
+        if not self.streaming:
+            # The whole body is known; compress it at once.
+            self._compress_body()
+
             # We're not streaming, auto-write content-length if not
-            # already set.
-            if 'Content-Length' not in self.headers:
+            # already set; the body of a `HEAD` is never written so its
+            # length is only known if it was set. Once an asynchronous
+            # response streams, its headers are gone.
+            resource = self._resource
+            head = resource is not None and resource.request.method == 'HEAD'
+            if 'Content-Length' not in self.headers and not head:
                 self.headers['Content-Length'] = self.tell()
 
         # Flush out the current buffer.
         self.flush()
 
+        if self._compressor is not None:
+            # Terminate the compressed stream.
+            chunk = self._compressor.flush()
+            self._compressor = None
+            self.body = chunk if (self._body is None) else (self._body + chunk)
+
         # We're done with the response; inform the HTTP connector
         # to close the response stream.
         self._closed = True
@@ -368,11 +389,22 @@ class Response(object):
         # Ensure we're not closed.
         self.require_not_closed()
 
+        if self.asynchronous and not self.streaming:
+            # The body starts streaming with this chunk; determine now
+            # whether it is compressed (while headers may be set).
+            self._start_compression()
+
         # Pull out the accumulated chunk.
         chunk = self._stream.getvalue()
         self._stream.truncate(0)
         self._stream.seek(0)
 
+        if self._compressor is not None and chunk:
+            # Compress the chunk; everything given to the compressor
+            # so far is sent out with it.
+            chunk = (self._compressor.compress(chunk) +
+                     self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
         # Append the chunk to the body.
         self.body = chunk if (self._body is None) else (self._body + chunk)
 
@@ -380,6 +412,93 @@ class Response(object):
             # We are now streaming because we're asynchronous.
             self.streaming = True
 
+    def begin_streaming(self):
+        """Starts streaming the body to the client.
+
+        Headers can't be changed from here on; the body is compressed
+        chunk by chunk as it is flushed if a content coding is negotiated.
+        """
+        self._start_compression()
+        self.streaming = True
+
+    def _negotiate_compression(self, length=None):
+        """Determines the content coding to compress the body with.
+
+        @param[in] length
+            The length of the whole body; None if it is streamed.
+
+        @returns
+            A compressor for the negotiated coding; None if the body is
+            to be sent as is.
+        """
+        self._negotiated = True
+
+        resource = self._resource
+        if resource is None or 'Content-Encoding' in self.headers:
+            # Not bound to a resource or the body is already encoded.
+            return None
+
+        meta = resource.meta
+        if not meta.compression or resource.request.method == 'HEAD':
+            # Nothing to compress.
+            return None
+
+        if length is not None and (
+                not length or length < meta.compression_threshold):
+            # The body is too small to be worth compressing.
+            return None
+
+        coding = compression.negotiate(
+            resource.request.get('Accept-Encoding'), meta.compression)
+
+        if coding is None:
+            # The client doesn't accept any of our codings.
+            return None
+
+        self.headers['Content-Encoding'] = coding
+
+        etag = self.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            # The tag describes the uncompressed body; it only matches
+            # the compressed one weakly.
+            self.headers['ETag'] = 'W/' + etag
+
+        return compression.compressor(coding, meta.compression_level)
+
+    def _compress_body(self):
+        """Compresses the whole body at once (if it is worth it)."""
+        if self._negotiated:
+            # Already determined.
+            return
+
+        content = (self._body or b'') + self._stream.getvalue()
+        compressor = self._negotiate_compression(len(content))
+        if compressor is None:
+            # Send the body as is.
+            return
+
+        if 'Content-Length' in self.headers:
+            # The length changes; it is determined again on close.
+            del self.headers['Content-Length']
+
+        # Replace the body with its compressed form.
+        self.body = None
+        self._stream.truncate(0)
+        self._stream.seek(0)
+        self._stream.write(compressor.compress(content) + compressor.flush())
+
+    def _start_compression(self):
+        """Compresses the body as it is streamed (if negotiated)."""
+        if self._negotiated:
+            # Already determined.
+            return
+
+        self._compressor = self._negotiate_compression()
+        if self._compressor is not None and self._body:
+            # Compress what has been flushed but not yet sent.
+            self.body = (self._compressor.compress(self._body) +
+                         self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
     def send(self, *args, **kwargs):
         """Writes the passed chunk and flushes it to the client."""
         self.write(*args, **kwargs)
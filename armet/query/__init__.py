@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
-from .parser import Query, QuerySegment
+from .parser import Query, QuerySegment, QueryGroup
 
 __all__ = [
     'Query',
-    'QuerySegment'
+    'QuerySegment',
+    'QueryGroup'
 ]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Splits a query string into a stream of tokens in a single pass.
+"""
+from __future__ import absolute_import, unicode_literals, division
+import re
+from . import constants
+
+
+#! Token kinds.
+COMBINATOR = 'combinator'
+NEGATION = 'negation'
+OPERATOR = 'operator'
+SEPARATOR = 'separator'
+NAME = 'name'
+VALUES = 'values'
+GROUP_BEGIN = 'group_begin'
+GROUP_END = 'group_end'
+
+
+def _alternation(symbols):
+    # Longest symbols first so that the regular expression is greedy.
+    return '|'.join(map(re.escape, sorted(symbols, key=len, reverse=True)))
+
+
+#! Characters that terminate a segment.
+_TERMINALS = (constants.LOGICAL_AND + constants.LOGICAL_OR +
+              constants.GROUP_BEGIN + constants.GROUP_END)
+
+#! Characters that have a special meaning outside of a value.
+_SPECIAL = ''.join(set(
+    [_TERMINALS, constants.NEGATION[1], constants.SEP_PATH] +
+    [x[0] for _, x in constants.OPERATORS if x]))
+
+#! Matches the next token in the subject of a segment
+#! (eg. `!foo.bar` or `<=`).
+PATH_TOKEN = re.compile(
+    r'(?P<{}>[{}])|(?P<{}>{})|(?P<{}>{})|(?P<{}>{})|(?P<{}>{})|'
+    r'(?P<{}>{})|(?P<{}>[^{}]+)'.format(
+        COMBINATOR, re.escape(constants.LOGICAL_AND + constants.LOGICAL_OR),
+        GROUP_BEGIN, re.escape(constants.GROUP_BEGIN),
+        GROUP_END, re.escape(constants.GROUP_END),
+        NEGATION, re.escape(constants.NEGATION[1]),
+        OPERATOR, _alternation(x for _, x in constants.OPERATORS if x),
+        SEPARATOR, re.escape(constants.SEP_PATH),
+        NAME, re.escape(_SPECIAL)))
+
+#! Matches the values of a segment; everything up to the next combinator
+#! or the end of the enclosing group.
+VALUE_TOKEN = re.compile(r'[^{}]*'.format(re.escape(
+    constants.LOGICAL_AND + constants.LOGICAL_OR + constants.GROUP_END)))
+
+
+def tokenize(text):
+    """Generates `(kind, text)` tokens from the passed query string.
+
+    Values are emitted as a single `VALUES` token containing the raw
+    (separated) text of the values; values end at a combinator or at the
+    end of a group.
+
+    @throws ValueError
+        When a character is found that cannot begin a token.
+    """
+    position = 0
+    length = len(text)
+    while position < length:
+        match = PATH_TOKEN.match(text, position)
+        if match is None:
+            raise ValueError('Unexpected `{}`'.format(text[position]))
+
+        kind = match.lastgroup
+        position = match.end()
+        yield kind, match.group()
+
+        if kind == OPERATOR:
+            # Everything up to the next combinator is a value.
+            match = VALUE_TOKEN.match(text, position)
+            value = match.group()
+            if value:
+                if value[0] == constants.NEGATION[1]:
+                    # Negation can only occur at the start of an operator.
+                    raise ValueError('Unexpected negation.')
+
+                yield VALUES, value
+
+            position = match.end()
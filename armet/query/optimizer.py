@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Reduces query expressions to the smallest equivalent expression before
+they are handed to a model connector.
+"""
+from __future__ import absolute_import, unicode_literals, division
+import operator
+import six
+from . import constants
+from .parser import QuerySegment, QueryGroup
+
+
+#! Expression that matches everything (an empty `and`).
+EVERYTHING = QueryGroup(operator.and_)
+
+#! Expression that matches nothing (an empty `or`).
+NOTHING = QueryGroup(operator.or_)
+
+#! Operators that test for membership in the set of values.
+EQUALITY_OPERATORS = (
+    constants.OPERATOR_EQUAL[0],
+    constants.OPERATOR_IEQUAL[0],
+    constants.OPERATOR_IN[0])
+
+#! Operators that bound the range of a path from below;
+#! mapped to if the bound is inclusive.
+LOWER_OPERATORS = {
+    constants.OPERATOR_GT[0]: False,
+    constants.OPERATOR_GTE[0]: True}
+
+#! Operators that bound the range of a path from above;
+#! mapped to if the bound is inclusive.
+UPPER_OPERATORS = {
+    constants.OPERATOR_LT[0]: False,
+    constants.OPERATOR_LTE[0]: True}
+
+
+def optimize(node):
+    """Reduces the expression to a smaller, equivalent expression.
+
+    Nested groups of the same combinator are flattened, duplicate
+    predicates are dropped, equality tests against the same path are
+    merged into a single set of values and contradictory `and` groups
+    (eg. `x>5&x<3`) are reduced to `NOTHING`.
+
+    Range detection compares the values of the segments; the values
+    should have been cleaned (eg. converted to integers) beforehand.
+    """
+    if isinstance(node, QuerySegment):
+        return node
+
+    children = []
+    for child in map(optimize, node.children):
+        if isinstance(child, QueryGroup):
+            if child.combinator == node.combinator:
+                # Flatten nested groups of the same combinator.
+                children.extend(child.children)
+                continue
+
+            if not child.children:
+                # An empty group of the other combinator absorbs this
+                # group (eg. `x & NOTHING` is `NOTHING`).
+                return child
+
+        children.append(child)
+
+    # Drop duplicate predicates.
+    children = _unique(children, key=_key)
+
+    # Merge equality tests against the same path. This is `x=1;x=2`
+    # within an `or` and `x!=1&x!=2` within an `and`.
+    children = _merge(children, negated=node.combinator == operator.and_)
+
+    if node.combinator == operator.and_ and _contradicts(children):
+        return NOTHING
+
+    if len(children) == 1:
+        return children[0]
+
+    return QueryGroup(node.combinator, children)
+
+
+def _key(node):
+    # Identity of a node; segments ignore their (legacy) combinator and
+    # groups ignore the order of their children.
+    if isinstance(node, QuerySegment):
+        return (node.path, node.operator, node.negated, node.directives,
+                node.values)
+
+    return node.combinator, frozenset(map(_key, node.children))
+
+
+def _unique(items, key=lambda x: x):
+    # Remove duplicates while preserving order.
+    seen = set()
+    result = []
+    for item in items:
+        k = key(item)
+        if k not in seen:
+            seen.add(k)
+            result.append(item)
+
+    return result
+
+
+def _merge(children, negated):
+    # Index of merged segments by their path, operator and directives.
+    merged = {}
+    result = []
+    for child in children:
+        if (not isinstance(child, QuerySegment)
+                or child.negated != negated
+                or child.operator not in EQUALITY_OPERATORS
+                or not child.values):
+            result.append(child)
+            continue
+
+        key = child.path, child.operator, child.directives
+        index = merged.get(key)
+        if index is None:
+            merged[key] = len(result)
+            values = _unique(child.values)
+            result.append(child._replace(values=tuple(values)))
+            continue
+
+        # Fold the values into the first segment of the path.
+        values = _unique(result[index].values + child.values)
+        result[index] = result[index]._replace(values=tuple(values))
+
+    return result
+
+
+def _tighter(bound, value, inclusive, comparison):
+    # Determine if the bound (value, inclusive) is tighter than the
+    # current bound.
+    if bound is None or comparison(value, bound[0]):
+        return value, inclusive
+
+    if value == bound[0]:
+        return value, inclusive and bound[1]
+
+    return bound
+
+
+def _empty(lower, upper):
+    # Test if the range between the passed bounds is empty.
+    return lower[0] > upper[0] or (
+        lower[0] == upper[0] and not (lower[1] and upper[1]))
+
+
+def _within(value, lower, upper):
+    # Test if the value is within the passed bounds.
+    if lower is not None:
+        if value < lower[0] or (value == lower[0] and not lower[1]):
+            return False
+
+    if upper is not None:
+        if value > upper[0] or (value == upper[0] and not upper[1]):
+            return False
+
+    return True
+
+
+def _contradicts(children):
+    """Determines if the children of an `and` can never be satisfied."""
+    # Gather the constraints on each path.
+    constraints = {}
+    abandoned = set()
+    for child in children:
+        if (not isinstance(child, QuerySegment) or child.negated
+                or not child.values or None in child.values
+                or child.path in abandoned):
+            continue
+
+        lower, upper, candidates = constraints.get(
+            child.path, (None, None, None))
+
+        try:
+            if child.operator in EQUALITY_OPERATORS:
+                values = set(child.values)
+                if child.operator == constants.OPERATOR_IEQUAL[0]:
+                    if any(isinstance(x, six.string_types) for x in values):
+                        # Case-insensitive text can't be compared here.
+                        continue
+
+                candidates = values if candidates is None else (
+                    candidates & values)
+
+            elif len(child.values) != 1:
+                # Range tests against several values are an `or`.
+                continue
+
+            elif child.operator in LOWER_OPERATORS:
+                lower = _tighter(
+                    lower, child.values[0],
+                    LOWER_OPERATORS[child.operator], operator.gt)
+
+            elif child.operator in UPPER_OPERATORS:
+                upper = _tighter(
+                    upper, child.values[0],
+                    UPPER_OPERATORS[child.operator], operator.lt)
+
+            constraints[child.path] = lower, upper, candidates
+
+        except TypeError:
+            # Values that can't be compared or hashed; give up on the path.
+            constraints.pop(child.path, None)
+            abandoned.add(child.path)
+
+    # Check each path for an empty range.
+    for lower, upper, candidates in constraints.values():
+        try:
+            if candidates is not None:
+                if not any(_within(x, lower, upper) for x in candidates):
+                    return True
+
+            elif lower is not None and upper is not None:
+                if _empty(lower, upper):
+                    return True
+
+        except TypeError:
+            # Values that can't be compared.
+            continue
+
+    return False
@@ -4,8 +4,8 @@ import six
 from six.moves import cStringIO as StringIO
 import operator
 import collections
-from itertools import chain
-from . import constants
+from armet import utils
+from . import constants, lexer
 
 
 #! Operation to combinator map.
@@ -14,10 +14,6 @@ COMBINATORS = {
     constants.LOGICAL_OR: operator.or_}
 
 
-#! Set of characters that begin an operator.
-OPERATOR_BEGIN_CHARS = set(x[0] for _, x in constants.OPERATORS if x)
-OPERATOR_BEGIN_CHARS.add(constants.NEGATION[1])
-
 #! Dictionary of operator symbols to operators.
 OPERATOR_SYMBOL_MAP = dict((v, k) for k, v in constants.OPERATORS if v)
 
@@ -28,11 +24,36 @@ OPERATOR_KEYWORDS = set(k for k, _ in constants.OPERATORS)
 
 class Query(collections.Sequence):
     """Represents a complete query expression.
+
+    The query is a sequence of its segments (in the order they were
+    written) and holds the expression tree (`expression`) that combines
+    them.
+
+    Queries are immutable (and hashable) so that a parsed query may be
+    cached and shared between requests.
     """
 
-    def __init__(self, segments=None):
+    def __init__(self, segments=None, expression=None):
+        if expression is None:
+            # Combine the segments using their combinators.
+            expression = _fold(segments or ())
+
+        elif segments is None:
+            # Collect the segments from the expression.
+            segments = _leaves(expression)
+
         #! The various query segments.
-        self.segments = [] if segments is None else segments
+        object.__setattr__(self, 'segments', tuple(segments or ()))
+
+        #! The root of the expression tree; either a query segment or
+        #! a query group.
+        object.__setattr__(self, 'expression', expression)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Query objects are immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Query objects are immutable.')
 
     def __getitem__(self, index):
         return self.segments[index]
@@ -40,101 +61,268 @@ class Query(collections.Sequence):
     def __len__(self):
         return len(self.segments)
 
+    def __hash__(self):
+        return hash(self.expression)
+
+    def __eq__(self, other):
+        return (isinstance(other, Query)
+                and self.expression == other.expression)
+
+    def __ne__(self, other):
+        return not self == other
+
     def __repr__(self):
         return str(self)
 
     def __str__(self):
-        o = StringIO()
+        if isinstance(self.expression, QuerySegment):
+            return '({})'.format(self.expression)
 
-        o.write('(')
+        return str(self.expression)
 
-        for index, segment in enumerate(self):
 
-            o.write(str(segment))
+class QueryGroup(collections.namedtuple('QueryGroup', (
+        'combinator', 'children'))):
+    """
+    Represents a group of query segments (or further groups) joined by
+    a single combinator (eg. `(a & b & c)`).
 
-            if index + 1 < len(self):
-                comb = '&' if segment.combinator == operator.and_ else '|'
-                o.write(' {} '.format(comb))
+    An empty `and` group matches everything and an empty `or` group
+    matches nothing.
+    """
 
-        o.write(')')
+    __slots__ = ()
+
+    def __new__(cls, combinator, children=()):
+        return super(QueryGroup, cls).__new__(
+            cls, combinator, tuple(children))
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self):
+        comb = ' & ' if self.combinator == operator.and_ else ' | '
+        return '({})'.format(comb.join(map(str, self.children)))
+
+
+def _group(combinator, children):
+    # Groups of a single node are just the node.
+    return children[0] if len(children) == 1 else QueryGroup(
+        combinator, children)
 
-        return o.getvalue()
+
+def _fold(segments):
+    """
+    Builds an expression from a flat list of segments; `and` takes
+    precedence over `or`.
+    """
+    if not segments:
+        # An empty query matches everything.
+        return QueryGroup(operator.and_)
+
+    terms = []
+    factors = []
+    for segment in segments:
+        factors.append(segment)
+        if segment.combinator == operator.or_:
+            terms.append(_group(operator.and_, factors))
+            factors = []
+
+    if factors:
+        terms.append(_group(operator.and_, factors))
+
+    return _group(operator.or_, terms)
+
+
+def _leaves(node):
+    """Collects the segments of an expression in order."""
+    if isinstance(node, QuerySegment):
+        return [node]
+
+    return [x for child in node.children for x in _leaves(child)]
+
+
+def negate(node):
+    """Negates an expression by applying De Morgan's laws.
+
+    The negation is pushed down to the segments so that the expression
+    tree never contains a negated group.
+    """
+    if isinstance(node, QuerySegment):
+        return node._replace(negated=not node.negated)
+
+    combinator = (operator.or_ if node.combinator == operator.and_
+                  else operator.and_)
+
+    return QueryGroup(combinator, map(negate, node.children))
+
+
+#! Cache of parsed queries keyed by the query text. Query strings
+#! are highly repetitive (the same few filters are requested over and
+#! over) so this removes the parsing from the majority of requests.
+cache = utils.LRUCache(maxsize=1024)
 
 
 def parse(text, encoding='utf8'):
     """Parse the querystring into a normalized form."""
-    # Initialize the query object.
-    query = Query()
-
     # Decode the text if we got bytes.
     if isinstance(text, six.binary_type):
         text = text.decode(encoding)
 
-    # Iterate through the characters in the query string; one-by-one
-    # in order to perform one-pass parsing.
-    stream = StringIO()
+    # Check for a previously parsed query.
+    query = cache.get(text)
+    if query is None:
+        # Parse and remember the query.
+        query = _parse(text)
+        cache.set(text, query)
 
-    for character in text:
+    # Return the constructed query object.
+    return query
 
-        # We want to stop reading the query and pass it off to someone
-        # when we reach a logical or grouping operator.
-        if character in (constants.LOGICAL_AND, constants.LOGICAL_OR):
 
-            if not stream.tell():
-                # There is no content in the stream; a logical operator
-                # was found out of place.
-                raise ValueError('Found `{}` out of place'.format(
-                    character))
+def _parse(text):
+    # Read the tokens of the query string.
+    tokens = list(lexer.tokenize(text))
+    if not tokens:
+        # An empty query string.
+        return Query()
 
-            # Parse the segment up till the combinator
-            segment = parse_segment(stream.getvalue(), character)
-            query.segments.append(segment)
-            stream.truncate(0)
-            stream.seek(0)
+    # Parse the tokens into an expression tree.
+    state = _ParseState(tokens)
+    expression = _parse_expression(state)
+    if state.peek() is not None:
+        # Something was left over (eg. an unbalanced `)`).
+        raise ValueError('Found `{}` out of place'.format(state.value()))
 
-        else:
-            # This isn't a special character, just roll with it.
-            stream.write(character)
+    # Return the constructed query object.
+    return Query(expression=expression)
 
-    # TODO: Throw some nonsense here if the query string ended with a
-    # & or ;, because that makes no sense.
 
-    if stream.tell():
-        # Append the remainder of the query string.
-        query.segments.append(parse_segment(stream.getvalue()))
+class _ParseState(object):
+    """Position of the parser in the token stream."""
 
-    # Return the constructed query object.
-    return query
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
 
+    def peek(self):
+        """Returns the kind of the current token (None at the end)."""
+        if self.index < len(self.tokens):
+            return self.tokens[self.index][0]
 
-class QuerySegment(object):
+    def value(self):
+        """Returns the text of the current token."""
+        return self.tokens[self.index][1]
+
+    def advance(self):
+        """Consumes and returns the current token."""
+        self.index += 1
+        return self.tokens[self.index - 1]
+
+
+def _parse_combination(state, combinator, parse_operand):
+    # Parse operands separated by the combinator.
+    children = [parse_operand(state)]
+    while (state.peek() == lexer.COMBINATOR
+            and state.value() == combinator):
+        state.advance()
+        if state.peek() is None:
+            # The query string ended with a combinator.
+            break
+
+        children.append(parse_operand(state))
+
+    return _group(COMBINATORS[combinator], children)
+
+
+def _parse_expression(state):
+    # expression := term (';' term)*
+    return _parse_combination(state, constants.LOGICAL_OR, _parse_term)
+
+
+def _parse_term(state):
+    # term := factor ('&' factor)*
+    return _parse_combination(state, constants.LOGICAL_AND, _parse_factor)
+
+
+def _parse_factor(state):
+    # factor := '!'* '(' expression ')' | segment
+    start = state.index
+    negated = False
+    while state.peek() == lexer.NEGATION:
+        state.advance()
+        negated = not negated
+
+    if state.peek() == lexer.GROUP_BEGIN:
+        # A (possibly negated) group.
+        state.advance()
+        node = _parse_expression(state)
+        if state.peek() != lexer.GROUP_END:
+            raise ValueError('Expected `{}`'.format(constants.GROUP_END))
+
+        state.advance()
+        return negate(node) if negated else node
+
+    # A segment; collect its tokens (including any leading negation).
+    state.index = start
+    tokens = []
+    while state.peek() not in (
+            None, lexer.COMBINATOR, lexer.GROUP_BEGIN, lexer.GROUP_END):
+        tokens.append(state.advance())
+
+    if not tokens:
+        # There is no content in the segment; a logical or grouping
+        # operator was found out of place.
+        raise ValueError('Found `{}` out of place'.format(
+            state.value() if state.peek() else ''))
+
+    # The combinator that follows the segment (if any).
+    combinator = constants.LOGICAL_AND
+    if state.peek() == lexer.COMBINATOR:
+        combinator = state.value()
+
+    return _build_segment(tokens, combinator)
+
+
+class QuerySegment(collections.namedtuple('QuerySegment', (
+        'path', 'operator', 'negated', 'directives', 'values',
+        'combinator'))):
     """
     Represents a single query segment with a subject path (`x.a.g`),
     an operator (`=` or `<=`), optional directives (`sort`), and
     a set of values (`5,12,56`).
+
+    Query segments are immutable; use `_replace` to derive a modified
+    segment.
     """
 
-    def __init__(self, **kwargs):
-        #! Path to the attribute being tested (as a list of segments).
-        self.path = kwargs.get('path', [])
+    __slots__ = ()
+
+    def __new__(cls, **kwargs):
+        return super(QuerySegment, cls).__new__(
+            cls,
+
+            #! Path to the attribute being tested (as a tuple of segments).
+            path=tuple(kwargs.get('path', ())),
 
-        #! This is the operator that is being applied to the attribute path.
-        self.operator = kwargs.get('operator', constants.OPERATOR_IEQUAL[0])
+            #! This is the operator that is being applied to the
+            #! attribute path.
+            operator=kwargs.get('operator', constants.OPERATOR_IEQUAL[0]),
 
-        #! Negation; if this operation has been negated.
-        self.negated = kwargs.get('negated', False)
+            #! Negation; if this operation has been negated.
+            negated=kwargs.get('negated', False),
 
-        #! Directives. Directives are a key-value way of specifying commands
-        #! on an attribute path.
-        self.directives = kwargs.get('directives', [])
+            #! Directives. Directives are a key-value way of specifying
+            #! commands on an attribute path.
+            directives=tuple(kwargs.get('directives', ())),
 
-        #! Values. Set of values that the attribute path is being checked
-        #! against. Only one has to match.
-        self.values = kwargs.get('values', [])
+            #! Values. Set of values that the attribute path is being
+            #! checked against. Only one has to match.
+            values=tuple(kwargs.get('values', ())),
 
-        #! The combinator that is used to combine this and the next
-        #! query.
-        self.combinator = kwargs.get('combinator', operator.and_)
+            #! The combinator that is used to combine this and the next
+            #! query.
+            combinator=kwargs.get('combinator', operator.and_))
 
     def __repr__(self):
         return str(self)
@@ -159,114 +347,94 @@ class QuerySegment(object):
         return o.getvalue()
 
 
-def _parse_operator(segment, iterator):
-    """Parses the operator (eg. '==' or '<')."""
-    stream = StringIO()
-    for character in iterator:
-        if character == constants.NEGATION[1]:
-            if stream.tell():
-                # Negation can only occur at the start of an operator.
-                raise ValueError('Unexpected negation.')
-
-            # We've been negated.
-            segment.negated = not segment.negated
-            continue
-
-        if (stream.getvalue() + character not in OPERATOR_SYMBOL_MAP and
-                stream.getvalue() + character not in OPERATOR_BEGIN_CHARS):
-            # We're no longer an operator.
-            break
-
-        # Expand the operator
-        stream.write(character)
-
-    # Check for existance.
-    text = stream.getvalue()
-    if text not in OPERATOR_SYMBOL_MAP:
-        # Doesn't exist because of a mis-placed negation in the middle
-        # of the path.
-        raise ValueError('Unexpected negation.')
-
-    # Set the found operator.
-    segment.operator = OPERATOR_SYMBOL_MAP[text]
-
-    # Return the remaining characters.
-    return chain(character, iterator)
-
-
 def parse_segment(text, combinator=constants.LOGICAL_AND):
-    # Initialize a query segment.
-    segment = QuerySegment()
-
-    # Construct an iterator over the segment text.
-    iterator = iter(text)
-    stream = StringIO()
-
-    # Iterate through the characters in the segment; one-by-one
-    # in order to perform one-pass parsing.
-    for character in iterator:
-
-        if (character == constants.NEGATION[1]
-                and not stream.tell() and not segment.path):
-            # We've been negated.
-            segment.negated = not segment.negated
-            continue
-
-        if character in OPERATOR_BEGIN_CHARS:
-            # Found an operator; pull out what we can.
-            iterator = _parse_operator(segment, chain(character, iterator))
-
-            # We're done here; go to the value parser
-            break
-
-        if character == constants.SEP_PATH:
-            # A path separator, push the current stack into the path
-            segment.path.append(stream.getvalue())
-            stream.truncate(0)
-            stream.seek(0)
-
-            # Keep checking for more path segments.
-            continue
-
-        # Append the text to the stream
-        stream.write(character)
+    """Parse the text of a single segment (eg. `foo.bar!=3,4`)."""
+    tokens = list(lexer.tokenize(text))
+    for kind, value in tokens:
+        if kind in (lexer.COMBINATOR, lexer.GROUP_BEGIN, lexer.GROUP_END):
+            raise ValueError('Found `{}` out of place'.format(value))
+
+    return _build_segment(tokens, combinator)
+
+
+def _build_segment(tokens, combinator=constants.LOGICAL_AND):
+    # Initialize the properties of the query segment.
+    path = []
+    name = ''
+    op = constants.OPERATOR_IEQUAL[0]
+    negated = False
+    values = ()
+
+    # True when a negation has begun an operator that has not yet
+    # been found.
+    pending = False
+
+    for kind, value in tokens:
+        if kind == lexer.NEGATION:
+            # We've been negated. Past the start of the segment a
+            # negation may only start an operator (eg. `!=`).
+            negated = not negated
+            pending = bool(path or name)
+
+        elif pending and kind != lexer.OPERATOR:
+            # Doesn't exist because of a mis-placed negation in the middle
+            # of the path.
+            raise ValueError('Unexpected negation.')
+
+        elif kind == lexer.NAME:
+            name = value
+
+        elif kind == lexer.SEPARATOR:
+            # A path separator, push the current name into the path.
+            path.append(name)
+            name = ''
+
+        elif kind == lexer.OPERATOR:
+            op = OPERATOR_SYMBOL_MAP[value]
+            pending = False
+
+        elif kind == lexer.VALUES:
+            # Values are not complicated (yet) so just slice and dice
+            # until we get a list of possible values.
+            values = value.split(constants.SEP_VALUE)
+
+    if pending:
+        # A negation was left dangling at the end of the segment.
+        raise ValueError('Unexpected negation.')
 
     # Write any remaining information into the path.
-    segment.path.append(stream.getvalue())
+    path.append(name)
 
     # Attempt to normalize the path.
     try:
         # The keyword 'not' can be the last item which
         # negates this query.
-        if segment.path[-1] == constants.NEGATION[0]:
-            segment.negated = not segment.negated
-            segment.path.pop(-1)
+        if path[-1] == constants.NEGATION[0]:
+            negated = not negated
+            path.pop(-1)
 
         # The last keyword can explicitly state the operation; in which
         # case the operator symbol **must** be `=`.
-        if segment.path[-1] in OPERATOR_KEYWORDS:
-            if segment.operator != constants.OPERATOR_IEQUAL[0]:
+        if path[-1] in OPERATOR_KEYWORDS:
+            if op != constants.OPERATOR_IEQUAL[0]:
                 raise ValueError(
                     'Explicit operations must use the `=` symbol.')
 
-            segment.operator = segment.path.pop(-1)
+            op = path.pop(-1)
 
         # Make sure we still have a path left.
-        if not segment.path:
+        if not path:
             raise IndexError()
 
     except IndexError:
         # Ran out of path items after removing operations and negation.
-        raise ValueError('No path specified in {}'.format(text))
-
-    # Values are not complicated (yet) so just slice and dice
-    # until we get a list of possible values.
-    segment.values = ''.join(iterator)
-    if segment.values:
-        segment.values = segment.values.split(constants.SEP_VALUE)
-
-    # Set the combinator.
-    segment.combinator = COMBINATORS[combinator]
+        raise ValueError('No path specified in {}'.format(
+            ''.join(value for _, value in tokens)))
 
     # Return the constructed query segment.
-    return segment
+    return QuerySegment(
+        path=path,
+        operator=op,
+        negated=negated,
+        values=values,
+        combinator=COMBINATORS[combinator])
@@ -1,15 +1,31 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
 import six
+import hashlib
 import logging
 from collections import Sequence
-from armet import http
+from armet import cache, http, utils
+from armet.cache import normalize_query
 from armet.exceptions import ValidationError
+from armet.query import constants
 from armet.resources.resource import base
 
 
 logger = logging.getLogger(__name__)
 
+#! Directive that limits the body of each item to the named attributes
+#! (eg. `/poll:fields=id,question`).
+DIRECTIVE_FIELDS = 'fields'
+
+#! Separates the name of a directive from its arguments.
+SEP_DIRECTIVE = '='
+
+#! Header that carries the entity tags of the bodies a client holds.
+HEADER_IF_NONE_MATCH = 'If-None-Match'
+
+#! Header that carries the date of the body a client holds.
+HEADER_IF_MODIFIED_SINCE = 'If-Modified-Since'
+
 
 class ManagedResource(base.Resource):
     """Implements the RESTful resource protocol for managed resources.
@@ -49,6 +65,10 @@ class ManagedResource(base.Resource):
     #! requested. None if a list is being requested.
     slug = None
 
+    #! The directives that modify how the resource is accessed
+    #! (eg. `['limit=10']` from `/<name>:limit=10`).
+    directives = None
+
     @classmethod
     def parse(cls, path):
         result = super(ManagedResource, cls).parse(path)
@@ -76,6 +96,154 @@ class ManagedResource(base.Resource):
         #! Map of errors that have occurred in the clean cycle.
         self._errors = {}
 
+        #! Names of the attributes included in the body; resolved on
+        #! first use by `get_fields`.
+        self._fields = None
+
+    def get_directive(self, name):
+        """Retrieves the arguments of the named directive.
+
+        @returns
+            The text following the name of the directive (eg. `10` from
+            `:limit=10`); None if the directive was not given.
+        """
+        args = None
+        for directive in self.directives or ():
+            key, _, value = directive.partition(SEP_DIRECTIVE)
+            if key == name:
+                # The last occurrence of a directive wins.
+                args = value
+
+        return args
+
+    def get_fields(self):
+        """Retrieves the names of the attributes to include in the body.
+
+        These are the attributes named by the `fields` directive, else
+        those named by the `fields` option, else every attribute; never
+        an attribute that isn't included.
+        """
+        if self._fields is not None:
+            # Already resolved for this request.
+            return self._fields
+
+        names = self.get_directive(DIRECTIVE_FIELDS)
+        if names is not None:
+            # The directive names attributes as they appear in the body.
+            names = set(names.split(constants.SEP_VALUE))
+            fields = [k for k, x in six.iteritems(self.attributes)
+                      if x.include and x.name in names]
+
+            if len(fields) != len(names):
+                # Unknown (or excluded) attributes were requested.
+                raise http.exceptions.BadRequest()
+
+        else:
+            # The option names attributes as they are declared.
+            names = self.meta.fields
+            fields = [k for k, x in six.iteritems(self.attributes)
+                      if x.include and (names is None or k in names)]
+
+        self._fields = fields
+        return fields
+
+    def dispatch(self, request, response):
+        # Continue on with the cycle.
+        result = super(ManagedResource, self).dispatch(request, response)
+
+        if request.method not in http.SAFE_METHODS:
+            # The request succeeded (and what it changed is committed);
+            # the cached responses of every resource of the group are
+            # stale.
+            cache.invalidate(self.cache_group)
+
+        return result
+
+    def route(self, request, response):
+        if self.meta.cache is None or request.method not in ('GET', 'HEAD'):
+            # Nothing is cached.
+            return super(ManagedResource, self).route(request, response)
+
+        # Build the key before anything is read.
+        key = self.cache_key()
+        entry = self.meta.cache.load(key)
+        if entry is not None:
+            # Ensure we're allowed to read the resource.
+            self.require_http_allowed_method(request)
+            self.assert_operations('read')
+
+            # Respond with the cached response.
+            self.make_cached_response(*entry)
+            return
+
+        # Continue on with the cycle; remembering the headers that are
+        # set before the response is built.
+        headers = dict(self.response.headers)
+        result = super(ManagedResource, self).route(request, response)
+
+        if (result is None and request.method == 'GET'
+                and self.response.status == http.client.OK
+                and not self.response.asynchronous):
+            # Cache the encoded body along with the headers that
+            # describe it.
+            self.response.flush()
+            headers = dict((name, value) for name, value in
+                           six.iteritems(dict(self.response.headers))
+                           if headers.get(name) != value)
+
+            self.meta.cache.store(key, (headers, self.response.body))
+
+        return result
+
+    @utils.classproperty
+    def cache_group(cls):
+        """
+        Name of the group of cached responses that are invalidated
+        together; the name of the resource.
+        """
+        return cls.meta.name
+
+    def cache_key(self):
+        """Builds the key of the cached response to this request."""
+        Serializer = self.determine_serializer()
+        scope = self.meta.authorization.scope(self.request.user, self)
+        return self.meta.cache.key(
+            self.cache_group,
+            self.meta.name,
+            self.request.protocol,
+            self.request.host,
+            self.request.mount_point,
+            self.request.path,
+            normalize_query(self.request.query),
+            Serializer.media_types[0] if Serializer else None,
+            scope)
+
+    def make_cached_response(self, headers, body):
+        """Fills the response object from a cached response."""
+        for name, value in six.iteritems(headers):
+            self.response[name] = value
+
+        # The client may already hold the cached body.
+        etag = self.response.headers.get('ETag')
+        if etag is not None and self.is_not_modified(etag):
+            self.response.status = http.client.NOT_MODIFIED
+            return
+
+        modified = http.parse_date(self.response.headers.get('Last-Modified'))
+        if modified is not None and self.is_not_modified_since(modified):
+            self.response.status = http.client.NOT_MODIFIED
+            return
+
+        if self.request.method == 'HEAD':
+            # The length of the body is known.
+            self.response['Content-Length'] = str(len(body))
+
+        else:
+            # Write the encoded body as it is.
+            self.response.write(body)
+
+        self.response.status = http.client.OK
+
     @property
     def allowed_operations(self):
         """Retrieves the allowed operations for this request."""
@@ -95,12 +263,108 @@ class ManagedResource(base.Resource):
             # Prepare the data for transmission.
             data = self.prepare(data)
 
-            # Encode the data using a desired encoder.
-            self.response.write(data, serialize=True)
+            if self.meta.etag and self.meta.etag_attribute is None:
+                # Encode the data using a desired encoder and tag the
+                # response with a hash of the encoded body.
+                text, serializer = self.serialize(data, response=None)
+                if self.is_not_modified(self.hash_etag(text), status):
+                    # The client holds the current body.
+                    self.response.status = http.client.NOT_MODIFIED
+                    return
+
+                self.response['Content-Type'] = serializer.media_types[0]
+                self.response.write(text)
+
+            else:
+                # Encode the data using a desired encoder.
+                self.response.write(data, serialize=True)
 
         # Make sure that the status code is set.
         self.response.status = status
 
+    def make_etag(self, data):
+        """
+        Derives the entity tag of the body from the `etag_attribute` of
+        the passed items (or item) without preparing them.
+
+        @note
+            The tag covers the slug and `etag_attribute` of each item,
+            the attributes included in the body, the path and the media
+            type of the body; an item that changes without changing its
+            `etag_attribute` keeps its tag.
+        """
+        if (isinstance(data, Sequence)
+                and not isinstance(data, six.string_types)):
+            items = data
+
+        else:
+            items = [data]
+
+        Serializer = self.determine_serializer()
+        attribute = self.attributes[self.meta.etag_attribute]
+        key = [Serializer.media_types[0] if Serializer else None,
+               self.path, self.get_fields()]
+
+        key.extend((self.meta.slug.get(x), attribute.get(x)) for x in items)
+
+        return self.hash_etag(repr(key))
+
+    def hash_etag(self, text):
+        """Builds a strong entity tag from a hash of the passed text."""
+        if isinstance(text, six.text_type):
+            text = text.encode('utf-8')
+
+        return '"{}"'.format(hashlib.sha1(text).hexdigest())
+
+    def is_not_modified(self, etag, status=http.client.OK):
+        """Tags the response and tests the tag against `If-None-Match`.
+
+        @returns
+            True if the request is safe and the client already holds the
+            body of the passed entity tag.
+        """
+        self.response['ETag'] = etag
+
+        if (status != http.client.OK
+                or self.request.method not in http.SAFE_METHODS):
+            # Only a successful read can be answered as not modified.
+            return False
+
+        header = self.request.get(HEADER_IF_NONE_MATCH)
+        if not header:
+            # The request isn't conditional.
+            return False
+
+        # The tags are compared weakly (the `W/` prefix is ignored).
+        for tag in header.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+
+            if tag == '*' or tag == etag:
+                return True
+
+        return False
+
+    def is_not_modified_since(self, seconds):
+        """Dates the response and tests the date against `If-Modified-Since`.
+
+        @param[in] seconds
+            The seconds since the epoch that the body was last modified.
+
+        @returns
+            True if the client already holds the body; a request with
+            an `If-None-Match` is left to the entity tag.
+        """
+        self.response['Last-Modified'] = http.format_date(seconds)
+
+        if HEADER_IF_NONE_MATCH in self.request:
+            # The entity tag decides.
+            return False
+
+        since = http.parse_date(self.request.get(HEADER_IF_MODIFIED_SINCE))
+        return since is not None and seconds <= since
+
     def prepare(self, data):
         if data is None:
             # No data; return nothing.
@@ -151,22 +415,22 @@ class ManagedResource(base.Resource):
         obj = {}
 
         # Iterate through the attributes and build the object from the item.
-        for name, attribute in self.attributes.items():
-            if attribute.include:
-                # Run the attribute through its prepare cycle.
-                obj[attribute.name] = self.attribute_prepare(
-                    name, attribute, item)
+        for name in self.get_fields():
+            # Run the attribute through its prepare cycle.
+            attribute = self.attributes[name]
+            obj[attribute.name] = self.attribute_prepare(name, attribute, item)
 
         # Return the resultant object.
         return obj
 
-    def _clean(self, target, data):
+    def _clean(self, target, data, partial=False):
         # Wrap clean so that it can be extended and have validation
         # errors properly handled.
 
         # HACK: Replace this later with passing item down through clean(...) --
         # however this is to fix a bug and should not break the API.
         self.__target = target
+        self.__partial = partial
 
         try:
             data = self.clean(data)
@@ -205,6 +469,10 @@ class ManagedResource(base.Resource):
         obj = {}
 
         for name, attribute in self.attributes.items():
+            if self.__partial and attribute.name not in item:
+                # Only the attributes that are present are cleaned.
+                continue
+
             value = item.get(attribute.name)
 
             try:
@@ -249,6 +517,15 @@ class ManagedResource(base.Resource):
         # A slug exists; this is being accessed as an item.
         return self.meta.http_detail_allowed_methods
 
+    @property
+    def http_cache(self):
+        if self.slug is None:
+            # No slug means that we're accessing this as a list.
+            return self.meta.http_list_cache
+
+        # A slug exists; this is being accessed as an item.
+        return self.meta.http_detail_cache
+
     def require_http_allowed_method(self, request):
         # No super call as the following replaces it by checking
         # only against the more specific `list_*` or `detail_*` http
@@ -266,7 +543,26 @@ class ManagedResource(base.Resource):
         self.assert_operations('read')
 
         # Delegate to `read` to retrieve the items.
-        items = self.read()
+        items = self.resolve(self.read)
+
+        if self.meta.etag and self.meta.etag_attribute is not None:
+            # Tag the response from the items before they are prepared.
+            if self.is_not_modified(self.make_etag(items)):
+                # The client holds the current body.
+                self.response.status = http.client.NOT_MODIFIED
+                return
+
+        # Build the response object.
+        self.make_response(items)
+
+    def resolve(self, read):
+        """Reads the requested items with the passed function.
+
+        If a specific resource is requested but nothing is returned, what
+        we understand as a slug is resolved as a path instead (eg. the
+        attribute of each item of `/poll/question/`).
+        """
+        items = read()
 
         if self.slug is not None and not items:
             # Requested a specific resource but nothing is returned.
@@ -277,15 +573,66 @@ class ManagedResource(base.Resource):
             self.slug = None
 
             # Attempt to retreive the resource again.
-            items = self.read()
+            items = read()
 
             # Ensure that if we have a slug and still no items that a 404
             # is rasied appropriately.
             if not items:
                 raise http.exceptions.NotFound()
 
-        # Build the response object.
-        self.make_response(items)
+        return items
+
+    def head(self, request, response):
+        """Processes a `HEAD` request.
+
+        Responds with the headers of a `GET` without preparing or
+        serializing the body. The items are only read if the entity tag is
+        derived from them (see the `etag_attribute` option); a hash of the
+        body can't be given without building it.
+        """
+        # Ensure we're allowed to read the resource.
+        self.assert_operations('read')
+
+        if self.meta.etag and self.meta.etag_attribute is not None:
+            # Tag the response from the items.
+            items = self.resolve(self.read)
+            if self.is_not_modified(self.make_etag(items)):
+                # The client holds the current body.
+                self.response.status = http.client.NOT_MODIFIED
+                return
+
+        elif self.slug is not None:
+            # Ensure the item exists without reading it.
+            self.resolve(self.exists)
+
+        if self.path:
+            # Ensure the path is to a single readable attribute.
+            attribute = None
+            if '/' not in self.path:
+                attribute = self.attributes.get(self.path)
+
+            if attribute is None:
+                raise http.exceptions.NotFound()
+
+            if not attribute.read:
+                raise http.exceptions.Forbidden()
+
+        # Give the type of the body that a `GET` would have.
+        Serializer = self.determine_serializer()
+        if Serializer is None:
+            raise http.exceptions.NotAcceptable()
+
+        self.response['Content-Type'] = Serializer.media_types[0]
+        self.response.status = http.client.OK
+
+    def exists(self):
+        """Determines if the requested items exist.
+
+        @note
+            This reads the items with `read`; model connectors count them
+            instead.
+        """
+        return bool(self.read())
 
     def post(self, request, response):
         """Processes a `POST` request."""
@@ -296,15 +643,33 @@ class ManagedResource(base.Resource):
         # Ensure we're allowed to create a resource.
         self.assert_operations('create')
 
-        # Deserialize and clean the incoming object.
+        # Deserialize and clean the incoming object (or array of objects).
         data = self._clean(None, self.request.read(deserialize=True))
 
-        # Delegate to `create` to create the item.
-        item = self.create(data)
+        if (isinstance(data, Sequence)
+                and not isinstance(data, six.string_types)):
+            # Delegate to `create_many` to create every item at once.
+            item = self.create_many(data)
+
+        else:
+            # Delegate to `create` to create the item.
+            item = self.create(data)
 
         # Build the response object.
         self.make_response(item, status=http.client.CREATED)
 
+    def create_many(self, data):
+        """Creates an item from each of the passed (cleaned) objects.
+
+        @note
+            This creates each item with `create`; model connectors
+            create the items in a single batched operation.
+
+        @returns
+            The list of created items.
+        """
+        return [self.create(x) for x in data]
+
     def put(self, request, response):
         """Processes a `PUT` request."""
         if self.slug is None:
@@ -342,17 +707,84 @@ class ManagedResource(base.Resource):
             # Build the response object.
             self.make_response(target, status=http.client.CREATED)
 
+    def patch(self, request, response):
+        """Processes a `PATCH` request.
+
+        Only the attributes present in the body are cleaned and set. A list
+        is updated as a whole; the attributes are set on every item that
+        the query matches. A list without a query isn't updated.
+        """
+        if self.slug is None and not self.request.query:
+            # Every item would be updated; a list is only updated as
+            # filtered by the query.
+            raise http.exceptions.BadRequest()
+
+        # Check if the resource exists.
+        target = self.read() if self.slug is not None else None
+        if self.slug is not None and target is None:
+            # There is nothing to patch.
+            raise http.exceptions.NotFound()
+
+        # Ensure we're allowed to update the resource.
+        self.assert_operations('update')
+
+        # Deserialize and clean the attributes present in the body.
+        data = self.request.read(deserialize=True)
+        if not isinstance(data, dict):
+            # Only an object can be applied.
+            raise http.exceptions.BadRequest()
+
+        data = self._clean(target, data, partial=True)
+
+        if target is None:
+            # Delegate to `update_many` to update the items.
+            self.update_many(data)
+
+            # Build the response object.
+            self.make_response(status=http.client.NO_CONTENT)
+            return
+
+        # Delegate to `update` to update the item.
+        self.update(target, data)
+
+        # Build the response object.
+        self.make_response(target, status=http.client.OK)
+
+    def update_many(self, data):
+        """Sets the passed (cleaned) values on every item of the list.
+
+        @returns
+            The number of items updated.
+        """
+        # Implemented by the model connector.
+        raise http.exceptions.NotImplemented()
+
     def delete(self, request, response):
-        """Processes a `DELETE` request."""
-        if self.slug is None:
-            # Mass-DELETE is not implemented.
-            raise http.exceptions.NotImplemented()
+        """Processes a `DELETE` request.
+
+        A list is destroyed as a whole; every item that the query matches
+        is destroyed. A list without a query isn't destroyed.
+        """
+        if self.slug is None and not self.request.query:
+            # Every item would be destroyed; a list is only destroyed as
+            # filtered by the query.
+            raise http.exceptions.BadRequest()
 
         # Ensure we're allowed to destroy a resource.
         self.assert_operations('destroy')
 
-        # Delegate to `destroy` to destroy the item.
-        self.destroy()
+        if self.slug is None:
+            # Delegate to `destroy_many` to destroy the items.
+            self.destroy_many()
+
+        else:
+            # Delegate to `destroy` to destroy the item.
+            self.destroy()
 
         # Build the response object.
         self.make_response(status=http.client.NO_CONTENT)
+
+    def destroy_many(self):
+        """Destroys every item of the list."""
+        # Implemented by the model connector.
+        raise http.exceptions.NotImplemented()
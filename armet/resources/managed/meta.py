@@ -2,6 +2,7 @@
 from __future__ import absolute_import, unicode_literals, division
 import six
 import collections
+from armet import cache
 from armet.exceptions import ImproperlyConfigured
 from armet.attributes import Attribute
 from ..resource.meta import ResourceBase
@@ -48,6 +49,23 @@ class ManagedResourceBase(ResourceBase):
         else:
             self.meta.slug = attributes[self.meta.slug]
 
+        # Ensure the default fields reference existing attributes.
+        for field in self.meta.fields or ():
+            if field not in attributes:
+                raise ImproperlyConfigured(
+                    'fields must reference existing attributes')
+
+        # Ensure the entity tag is derived from an existing attribute.
+        etag_attribute = self.meta.etag_attribute
+        if etag_attribute is not None and etag_attribute not in attributes:
+            raise ImproperlyConfigured(
+                'etag_attribute must reference an existing attribute')
+
+        if self.meta.cache is not None and not self.meta.abstract:
+            # Invalidate the cached responses whenever the group changes;
+            # through this resource or another.
+            cache.register(self.cache_group, self.meta.cache)
+
         # Cache access to the attribute preparation cycle.
         self.preparers = preparers = {}
         for key in attributes:
@@ -114,6 +114,24 @@ class ManagedResourceOptions(options.ResourceOptions):
             else:
                 self.http_detail_allowed_methods = self.http_allowed_methods
 
+        #! Directives of the `Cache-Control` header sent with responses
+        #! to a whole resource (eg /user); if undeclared or None, will be
+        #! defaulted to `http_cache`.
+        self.http_list_cache = meta.get('http_list_cache')
+        if self.http_list_cache is None:
+            self.http_list_cache = self.http_cache
+
+        options.check_cache(self.http_list_cache, 'http_list_cache')
+
+        #! Directives of the `Cache-Control` header sent with responses
+        #! to a single resource (eg /user/1); if undeclared or None, will
+        #! be defaulted to `http_cache`.
+        self.http_detail_cache = meta.get('http_detail_cache')
+        if self.http_detail_cache is None:
+            self.http_detail_cache = self.http_cache
+
+        options.check_cache(self.http_detail_cache, 'http_detail_cache')
+
         #! List of allowed operations against a whole resource.
         #! If undeclared or None, will be defaulted to `allowed_operations`.
         self.list_allowed_operations = meta.get('list_allowed_operations')
@@ -152,3 +170,35 @@ class ManagedResourceOptions(options.ResourceOptions):
             # is the primary key. This is as good as a default as any I
             # suppose.
             self.slug = 'id'
+
+        #! Names of the attributes (as declared on the resource) to include
+        #! in the body when a request doesn't name them with the `fields`
+        #! directive; None (the default) includes every attribute.
+        self.fields = meta.get('fields')
+
+        #! Name of an attribute (as declared on the resource) whose value
+        #! changes whenever an item does (eg. a version or the time it
+        #! was last updated). If set, the `ETag` of a `GET` is derived
+        #! from it before the items are prepared; a client that holds
+        #! the current body is answered with `304 Not Modified` without
+        #! preparing or serializing anything.
+        self.etag_attribute = meta.get('etag_attribute')
+
+        #! Whether to tag bodies with an `ETag` and answer a conditional
+        #! `GET` (`If-None-Match`) with `304 Not Modified`. Unless the
+        #! `etag_attribute` is set, the tag is a hash of the serialized
+        #! body. Defaults to True if the `etag_attribute` is set.
+        self.etag = meta.get('etag')
+        if self.etag is None:
+            self.etag = self.etag_attribute is not None
+
+        #! Response cache (eg. `armet.cache.MemoryCache()`) to answer `GET`
+        #! requests from; None (the default) caches nothing. Entries are
+        #! keyed on the resource, the path, the (normalized) query, the
+        #! serializer and the authorization scope (see
+        #! `Authorization.scope`) and are invalidated when a request that
+        #! changes the resource (or, for model resources, its model)
+        #! succeeds; through this resource or any other. Changes made
+        #! elsewhere (eg. to related models) are only seen once the entry
+        #! expires.
+        self.cache = meta.get('cache')
@@ -1,11 +1,44 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
+import json
+import base64
 import logging
+import operator
+from armet import http, attributes, utils
+from armet.query import parser, optimizer, constants, QuerySegment, QueryGroup
 from ..managed import base
 
 
 logger = logging.getLogger(__name__)
 
+#! Attribute used to clean the values of null tests (eg. `x.isnull=false`).
+_boolean = attributes.BooleanAttribute()
+
+#! Directive that orders a list by one or more attributes; a leading `-`
+#! sorts in descending order (eg. `/poll:sort=-votes,question`).
+DIRECTIVE_SORT = 'sort'
+
+#! Directive that limits the number of items in a list
+#! (eg. `/poll:limit=10`).
+DIRECTIVE_LIMIT = 'limit'
+
+#! Directive that skips a number of items at the start of a list
+#! (eg. `/poll:offset=20:limit=10`).
+DIRECTIVE_OFFSET = 'offset'
+
+#! Directive that continues a list after the item that the opaque cursor
+#! was made from (eg. `/poll:limit=10:cursor=WzEwXQ`). Cursors are handed
+#! out in the `Link` header of each full page.
+DIRECTIVE_CURSOR = 'cursor'
+
+#! Directive that responds with the number of items in a list rather
+#! than the items (eg. `/poll:count`).
+DIRECTIVE_COUNT = 'count'
+
+#! Header that pins a request to the primary database; a client that
+#! has just written sends it to read its own writes.
+HEADER_PRIMARY = 'X-Read-Primary'
+
 
 class ModelResource(base.ManagedResource):
     """Implements the RESTful resource protocol for model-bound resources.
@@ -15,3 +48,543 @@ class ModelResource(base.ManagedResource):
         resources. Derive from `armet.resources.ModelResource` (defined in
         the `__init__.py`).
     """
+
+    def get(self, request, response):
+        """Processes a `GET` request.
+
+        A list may be counted (with the `count` directive) rather than
+        read and its total count is given in the `X-Total-Count` header
+        if the `total_count` option is set.
+
+        If the `modified_attribute` option is set, a request whose
+        `If-Modified-Since` is still current is answered with
+        `304 Not Modified` before anything is read.
+        """
+        if (self.slug is None
+                and self.get_directive(DIRECTIVE_COUNT) is not None):
+            # Ensure we're allowed to read the resource.
+            self.assert_operations('read')
+
+            # Respond with just the number of items.
+            self.response.write({'count': self.count()}, serialize=True)
+            self.response.status = http.client.OK
+            return
+
+        if self.make_headers():
+            # The client holds the current body.
+            return
+
+        if self.slug is None and self.meta.streaming:
+            # Ensure we're allowed to read the resource.
+            self.assert_operations('read')
+
+            # Stream the list as it is read.
+            return self.make_stream(self.iterate())
+
+        return super(ModelResource, self).get(request, response)
+
+    def head(self, request, response):
+        """Processes a `HEAD` request.
+
+        The headers are built as they are for a `GET`; an item is counted
+        rather than read unless the entity tag is derived from it.
+        """
+        if self.make_headers():
+            # The client holds the current body.
+            return
+
+        return super(ModelResource, self).head(request, response)
+
+    def make_headers(self):
+        """
+        Dates the response (if the `modified_attribute` option is set)
+        and gives the total count of a list (if the `total_count` option
+        is set).
+
+        @returns
+            True if the client holds the current body; the response is
+            then `304 Not Modified`.
+        """
+        if self.meta.modified_attribute is not None:
+            # Ensure we're allowed to read the resource.
+            self.assert_operations('read')
+
+            # Date the response by the latest modification of the items.
+            modified = self.last_modified()
+            if modified is not None and self.is_not_modified_since(
+                    http.timestamp(modified)):
+                self.response.status = http.client.NOT_MODIFIED
+                return True
+
+        if self.slug is None and self.meta.total_count:
+            # Count every item that the filter matches.
+            self.assert_operations('read')
+            self.response['X-Total-Count'] = str(self.count())
+
+        return False
+
+    def exists(self):
+        # Count the items rather than read them.
+        return self.count() > 0
+
+    def use_replica(self):
+        """
+        Determines if this request may be served by a read replica (see
+        the `ReadSession` and `read_database` options of the model
+        connectors).
+
+        @returns
+            True for safe methods unless the request is pinned to the
+            primary by the `X-Read-Primary` header.
+        """
+        return (self.request.method in http.SAFE_METHODS
+                and HEADER_PRIMARY not in self.request)
+
+    @utils.classproperty
+    def cache_group(cls):
+        """
+        Name of the group of cached responses that are invalidated
+        together; the model, as the resources of a model change
+        together.
+        """
+        model = cls.meta.model
+        return '{}.{}'.format(model.__module__, model.__name__)
+
+    def last_modified(self):
+        """
+        Reads the latest `modified_attribute` of the items that are
+        requested without reading the items.
+
+        @note
+            Only modifications are seen; an item that is removed from
+            the list (or no longer matches its filter) doesn't change
+            the date of the list unless something else is modified.
+
+        @returns
+            The date/time; None if nothing is requested (or none of the
+            items have one).
+        """
+        # Implemented by the model connector.
+        raise http.exceptions.NotImplemented()
+
+    def make_stream(self, items):
+        """Prepares and serializes a list as it is iterated.
+
+        @returns
+            A generator of chunks of the body; each chunk holds up to
+            `chunk_size` items.
+        """
+        Serializer = self.determine_serializer()
+        if Serializer is None:
+            # No acceptable serializer.
+            raise http.exceptions.NotAcceptable(dict(
+                (x, self.meta.serializers[x].media_types[0])
+                for x in self.meta.allowed_serializers))
+
+        self.response['Content-Type'] = Serializer.media_types[0]
+        self.response.status = http.client.OK
+
+        # Prepare the items as they are serialized.
+        serializer = Serializer(self.request, None)
+        text = serializer.stream(self.item_prepare(x) for x in items)
+        return self._chunk(text)
+
+    def _chunk(self, text):
+        # Join the serialized text into chunks of items.
+        chunk = []
+        for value in text:
+            chunk.append(value)
+            if len(chunk) >= self.meta.chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+
+        if chunk:
+            yield ''.join(chunk)
+
+    def iterate(self):
+        """Reads the items of the list one at a time.
+
+        @returns
+            An iterable of the items that is read from the database
+            `chunk_size` items at a time.
+        """
+        # Implemented by the model connector.
+        raise http.exceptions.NotImplemented()
+
+    def count(self):
+        """Counts the items of the list without reading them.
+
+        @returns
+            The number of items that match the filter of the request.
+        """
+        # Implemented by the model connector.
+        raise http.exceptions.NotImplemented()
+
+    @classmethod
+    def build_loaders(cls):
+        """
+        Plans how the models related through the (dotted) attribute paths
+        are loaded so that a list doesn't load them an item at a time.
+        This is invoked once; when the class is created.
+
+        @returns
+            A dictionary of attribute names to the instructions (specific
+            to the model connector) that load what the attribute needs.
+        """
+        # Implemented by the model connector.
+        return {}
+
+    def build_expression(self, seek=True):
+        """Builds the expression used to filter the model for this request.
+
+        The expression is bound to this resource (the path of each segment
+        is the expanded attribute path and the values are cleaned) and
+        optimized.
+
+        @param[in] seek
+            Whether a list continued from a cursor includes the seek
+            predicate of the cursor.
+
+        @returns
+            The expression; `optimizer.NOTHING` if it can never match or
+            None if nothing is to be filtered.
+        """
+        if self.slug is not None:
+            # This is an item-access (eg. GET /<name>/:slug); ignore the
+            # query string and generate an expression based on the slug.
+            return self._bind_segment(QuerySegment(
+                operator=constants.OPERATOR_EQUAL[0],
+                values=[self.slug]), self.meta.slug, ())
+
+        expression = optimizer.EVERYTHING
+        if self.request.query:
+            try:
+                # This is a list-access; use the query string and construct
+                # a query object from it.
+                query = parser.parse(self.request.query)
+
+            except ValueError:
+                # The query string isn't understood.
+                raise http.exceptions.BadRequest()
+
+            # Bind the expression to this resource.
+            expression = self._bind(query.expression)
+
+        seek = self.build_seek() if seek else None
+        if seek is not None:
+            # Continue the list after the item of the cursor.
+            expression = QueryGroup(operator.and_, (expression, seek))
+
+        # Optimize the expression.
+        expression = optimizer.optimize(expression)
+        if expression == optimizer.EVERYTHING:
+            # Nothing is left to filter.
+            return None
+
+        return expression
+
+    def build_ordering(self):
+        """Builds the ordering of a list from the `sort` directive.
+
+        A bounded list (or one continued from a cursor) is additionally
+        ordered by the slug so that the order is total and pages are
+        stable.
+
+        @returns
+            A list of `(path, descending)` pairs where `path` is the
+            expanded attribute path (as a tuple).
+        """
+        return [(tuple(attribute.path.split('.')) + rest, descending)
+                for attribute, rest, descending in self._get_sort_keys()]
+
+    def _get_sort_keys(self):
+        # Gather the attribute, remaining path and direction of each key.
+        keys = []
+        args = self.get_directive(DIRECTIVE_SORT)
+        for item in args.split(constants.SEP_VALUE) if args else ():
+            # An optional leading sign gives the direction.
+            descending = item.startswith('-')
+            if item[:1] in ('-', '+'):
+                item = item[1:]
+
+            # Get the attribute in question.
+            names = item.split(constants.SEP_PATH)
+            attribute = self.attributes.get(names[0])
+            if attribute is None or attribute.path is None:
+                # Unknown attribute; can't sort by it.
+                raise http.exceptions.BadRequest()
+
+            keys.append((attribute, tuple(names[1:]), descending))
+
+        slug = self.meta.slug
+        if (self.get_directive(DIRECTIVE_CURSOR) is not None
+                or self.build_bounds() != (None, None)):
+            # Break ties with the slug; it is unique.
+            if (slug.path is not None
+                    and (slug, ()) not in [x[:2] for x in keys]):
+                keys.append((slug, (), False))
+
+        return keys
+
+    def build_seek(self):
+        """Builds the seek predicate from the `cursor` directive.
+
+        @returns
+            The expression; None if no cursor was given.
+        """
+        args = self.get_directive(DIRECTIVE_CURSOR)
+        if args is None:
+            # Not continuing a list.
+            return None
+
+        keys = self._get_sort_keys()
+        try:
+            # Decode the values of the cursor.
+            text = base64.urlsafe_b64decode(
+                (args + '=' * (-len(args) % 4)).encode('ascii'))
+
+            values = json.loads(text.decode('utf8'))
+
+        except (TypeError, ValueError):
+            # Not a cursor that we handed out.
+            raise http.exceptions.BadRequest()
+
+        if not isinstance(values, list) or len(values) != len(keys):
+            # Not a cursor for this ordering.
+            raise http.exceptions.BadRequest()
+
+        # Expand each key and clean its value.
+        paths = []
+        for (attribute, rest, descending), value in zip(keys, values):
+            path = tuple(attribute.path.split('.')) + rest
+            paths.append((path, descending, value if rest else (
+                attribute.try_clean(value))))
+
+        return self.build_keyset(paths)
+
+    def build_keyset(self, paths, nulls_largest=None):
+        """Builds the predicate that matches the items after an item.
+
+        For an ordering `(a, b)` and an item `(x, y)` this is
+        `a >= x & (a > x ; a == x & b > y)`; the redundant leading bound
+        lets the database seek an index on the first key.
+
+        @param[in] paths
+            A list of `(path, descending, value)` triples; one for each
+            key of the ordering, where `value` is that of the item.
+
+        @param[in] nulls_largest
+            Whether the database sorts null after every other value
+            (rather than before); None if no value of the item is null
+            and null values are not to be matched.
+
+        @returns
+            The expression.
+        """
+        def segment(path, op, value):
+            return QuerySegment(path=path, operator=op[0], values=[value])
+
+        terms = []
+        for index, (path, descending, value) in enumerate(paths):
+            # Equal on all previous keys.
+            factors = [segment(x, constants.OPERATOR_ISNULL, True)
+                       if y is None else
+                       segment(x, constants.OPERATOR_EQUAL, y)
+                       for x, _, y in paths[:index]]
+
+            # Nulls are together at one end of the ordering of a key.
+            last = nulls_largest is not None and nulls_largest != descending
+            if value is None and last:
+                # Nothing is past a null on this key.
+                continue
+
+            elif value is None:
+                # Every other value is past a null on this key.
+                past = segment(path, constants.OPERATOR_ISNULL, False)
+
+            else:
+                # Past the item on this key.
+                past = segment(
+                    path, constants.OPERATOR_LT if descending else (
+                        constants.OPERATOR_GT), value)
+
+                if last:
+                    past = QueryGroup(operator.or_, (
+                        past, segment(path, constants.OPERATOR_ISNULL, True)))
+
+            factors.append(past)
+            terms.append(QueryGroup(operator.and_, factors))
+
+        path, descending, value = paths[0]
+        if value is None or (
+                nulls_largest is not None and nulls_largest != descending):
+            # The leading bound would exclude null values.
+            return QueryGroup(operator.or_, terms)
+
+        lead = segment(
+            path, constants.OPERATOR_LTE if descending else (
+                constants.OPERATOR_GTE), value)
+
+        return QueryGroup(operator.and_, (
+            lead, QueryGroup(operator.or_, terms)))
+
+    def build_projection(self):
+        """Builds the set of model attributes to load for this request.
+
+        @returns
+            The names of the model attributes (the first segment of each
+            attribute path) needed to prepare the body; None if the body
+            includes every attribute and nothing is to be deferred.
+        """
+        fields = self.get_fields()
+        if self.path or self.request.method not in ('GET', 'HEAD'):
+            # Load everything.
+            return None
+
+        if self.request.method == 'HEAD':
+            # Nothing is prepared.
+            attributes = []
+
+        elif len(fields) == len(self.attributes):
+            # Load everything.
+            return None
+
+        else:
+            # The body needs the attributes of its fields.
+            attributes = [self.attributes[x] for x in fields]
+
+        # The slug and sort keys identify and order the items and the
+        # entity tag may be derived from an attribute.
+        attributes.append(self.meta.slug)
+        attributes.extend(x for x, _, _ in self._get_sort_keys())
+        if self.meta.etag and self.meta.etag_attribute is not None:
+            attributes.append(self.attributes[self.meta.etag_attribute])
+
+        return set(x.path.split('.')[0] for x in attributes
+                   if x.path is not None)
+
+    def link_next_page(self, items):
+        """
+        Sets the `Link` header of the response to the next page of the
+        list if the list is bounded and the page is full.
+
+        @note
+            Null can't be compared with; items with a null sort key are
+            not reachable through cursors. Sort by attributes that can't
+            be null when walking a list.
+        """
+        _, limit = self.build_bounds()
+        if limit is None or not items or len(items) < limit:
+            # There is no next page.
+            return
+
+        # Read the sort keys of the last item.
+        values = []
+        for attribute, rest, _ in self._get_sort_keys():
+            value = attribute.get(items[-1])
+            for name in rest:
+                value = getattr(value, name, None)
+
+            if value is None:
+                return
+
+            values.append(value if rest else attribute.prepare(value))
+
+        # Encode the cursor.
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(values).encode('utf8')).decode('ascii').rstrip('=')
+
+        # Replace any offset or cursor of this request with the new cursor.
+        directives = [x for x in self.directives or () if x.partition(
+            base.SEP_DIRECTIVE)[0] not in (DIRECTIVE_OFFSET, DIRECTIVE_CURSOR)]
+
+        directives.append(base.SEP_DIRECTIVE.join((DIRECTIVE_CURSOR, cursor)))
+
+        self.response['Link'] = '<{}://{}{}:{}{}{}>; rel="next"'.format(
+            self.request.protocol.lower(),
+            self.request.host,
+            self.request.mount_point,
+            constants.DIRECTIVE.join(directives),
+            '/' if self.meta.trailing_slash else '',
+            '?' + self.request.query if self.request.query else '')
+
+    def build_bounds(self):
+        """
+        Builds the bounds of a list from the `offset` and `limit`
+        directives and the `max_page_size` option.
+
+        @returns
+            A pair of `(offset, limit)`; either may be None if the list
+            isn't bounded in that direction.
+        """
+        offset = self._get_count_directive(DIRECTIVE_OFFSET)
+        limit = self._get_count_directive(DIRECTIVE_LIMIT)
+
+        # Never return more than a page of items.
+        maximum = self.meta.max_page_size
+        if maximum is not None and (limit is None or limit > maximum):
+            limit = maximum
+
+        return offset, limit
+
+    def _get_count_directive(self, name):
+        args = self.get_directive(name)
+        if args is None:
+            return None
+
+        try:
+            value = int(args)
+
+        except ValueError:
+            # Not a number.
+            raise http.exceptions.BadRequest()
+
+        if value < 0:
+            # Negative counts make no sense.
+            raise http.exceptions.BadRequest()
+
+        return value
+
+    def _bind(self, node):
+        if not isinstance(node, QuerySegment):
+            # Bind each node of the group.
+            children = tuple(map(self._bind, node.children))
+            return node._replace(children=children)
+
+        # Get the attribute in question.
+        attribute = self.attributes.get(node.path[0])
+        if attribute is None or attribute.path is None:
+            # Unknown attribute; can't filter on it.
+            raise http.exceptions.BadRequest()
+
+        return self._bind_segment(node, attribute, node.path[1:])
+
+    def _bind_segment(self, segment, attribute, rest):
+        # Boolean's should use `exact` rather than `iexact`.
+        op = segment.operator
+        if attribute.type is bool and op == constants.OPERATOR_IEQUAL[0]:
+            op = constants.OPERATOR_EQUAL[0]
+
+        if op == constants.OPERATOR_ISNULL[0]:
+            # Null tests are against a boolean; a bare null test
+            # (eg. `x.isnull`) is a test for null.
+            values = tuple(map(_boolean.clean, segment.values)) or (True,)
+
+        elif op == constants.OPERATOR_REGEX[0]:
+            # Regular expressions are matched against the text of the
+            # attribute; they are not values of the attribute.
+            values = segment.values
+
+        else:
+            values = tuple(map(attribute.try_clean, segment.values))
+
+        if not values:
+            # Nothing to test the attribute against (eg. `x=`).
+            raise http.exceptions.BadRequest()
+
+        return segment._replace(
+            # Replace the initial path segment with the expanded
+            # attribute path.
+            path=tuple(attribute.path.split('.')) + rest,
+            operator=op,
+            values=values)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
+from armet.exceptions import ImproperlyConfigured
 from ..managed import meta
 from . import options
 
@@ -9,3 +10,25 @@ class ModelResourceBase(meta.ManagedResourceBase):
     options = options.ModelResourceOptions
 
     connectors = ['http', 'model']
+
+    def __new__(cls, name, bases, attrs):
+        # Construct the class object.
+        self = super(ModelResourceBase, cls).__new__(cls, name, bases, attrs)
+
+        if not cls._is_resource(name, bases) or self.meta.abstract:
+            # This is not an actual resource.
+            return self
+
+        # Ensure the modification time is read from an existing attribute.
+        modified_attribute = self.meta.modified_attribute
+        if (modified_attribute is not None
+                and modified_attribute not in self.attributes):
+            raise ImproperlyConfigured(
+                'modified_attribute must reference an existing attribute')
+
+        # Plan how the models related through the attribute paths
+        # are loaded.
+        self.loaders = self.build_loaders()
+
+        # Return the constructed class object.
+        return self
@@ -16,3 +16,34 @@ class ModelResourceOptions(options.ManagedResourceOptions):
         if self.model is None and not self.abstract:
             raise ImproperlyConfigured(
                 'Model resources must be bound to a model.')
+
+        #! Maximum number of items that a list request may return. A list
+        #! request without a `limit` directive is limited to this many
+        #! items and a larger `limit` is reduced to it; None (the default)
+        #! places no bound on the size of the list.
+        self.max_page_size = meta.get('max_page_size')
+
+        #! Whether list responses give the number of items that match the
+        #! filter (ignoring any bounds) in the `X-Total-Count` header.
+        #! Counting costs a `SELECT COUNT(*)` per request.
+        self.total_count = meta.get('total_count', False)
+
+        #! Whether lists are streamed. A streamed list is read from the
+        #! database, prepared and serialized an item at a time so that the
+        #! memory used stays flat however long the list is; streamed lists
+        #! don't link to the next page.
+        self.streaming = meta.get('streaming', False)
+
+        #! Number of items read from the database (and written to the
+        #! client) at a time when streaming a list.
+        self.chunk_size = meta.get('chunk_size', 1000)
+
+        #! Name of an attribute (as declared on the resource) whose path
+        #! is a column of the model holding the date/time each item was
+        #! last modified. If set, a `GET`
+        #! first asks the database for the latest of them (with the same
+        #! filter and authorization as the items); the response gives it
+        #! in the `Last-Modified` header and a client whose
+        #! `If-Modified-Since` is still current is answered with
+        #! `304 Not Modified` without reading any items.
+        self.modified_attribute = meta.get('modified_attribute')
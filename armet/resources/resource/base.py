@@ -1,15 +1,22 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
 import logging
+import time
 import re
 import six
 import collections
 import mimeparse
-from armet import http, utils
+from armet import http, utils, authentication
 
 
 logger = logging.getLogger(__name__)
 
+#! Status codes of the responses that are sent with `Cache-Control`.
+CACHEABLE_STATUSES = (
+    http.client.OK,
+    http.client.NON_AUTHORITATIVE_INFORMATION,
+    http.client.NOT_MODIFIED)
+
 
 class Resource(object):
     """Implements the RESTful resource protocol for abstract resources.
@@ -114,6 +121,9 @@ class Resource(object):
             result = obj.dispatch(request, response)
 
             if not response.asynchronous:
+                # Describe how the response may be cached.
+                obj._process_cache_control(request, response)
+
                 # There is several things that dispatch is allowed to return.
                 if (isinstance(result, collections.Iterable) and
                         not isinstance(result, six.string_types)):
@@ -223,7 +233,7 @@ class Resource(object):
         # to capture any headers and status codes set.
         iterator = iter(sequence)
         data = {'chunk': next(iterator)}
-        response.streaming = True
+        response.begin_streaming()
 
         def streamer():
             # Iterate through the iterator and yield its content
@@ -254,6 +264,11 @@ class Resource(object):
                 # Close the response.
                 response.close()
 
+                if response.body:
+                    # Yield what was left to send on close (eg. the end
+                    # of a compressed body).
+                    yield response.body
+
         # Return the streaming function.
         return streamer()
 
@@ -358,6 +373,53 @@ class Resource(object):
                 # Ensure we have a response object.
                 request = self._request
 
+        # Determine the serializer to use.
+        Serializer = self.determine_serializer(request, format)
+        if Serializer:
+            try:
+                # Attempt to serialize the data using the determined
+                # serializer.
+                serializer = Serializer(request, response)
+                return serializer.serialize(data), serializer
+
+            except ValueError:
+                # Failed to serialize the data.
+                pass
+
+        # Either failed to determine a serializer or failed to serialize
+        # the data; construct a list of available and valid encoders.
+        available = {}
+        for name in self.meta.allowed_serializers:
+            Serializer = self.meta.serializers[name]
+            instance = Serializer(request, None)
+            if instance.can_serialize(data):
+                available[name] = Serializer.media_types[0]
+
+        # Raise a Not Acceptable exception.
+        raise http.exceptions.NotAcceptable(available)
+
+    @utils.boundmethod
+    def determine_serializer(self, request=None, format=None):
+        """Determines the serializer to use for a response.
+
+        @param[in] request
+            The request object to pull information from (the `Accept`
+            header). If this method is invoked as an instance method, the
+            request object can be omitted and it will be taken from the
+            instance.
+
+        @param[in] format
+            A specific format to serialize in; if provided, no detection is
+            done.
+
+        @returns
+            The serializer class; None if no serializer is acceptable.
+        """
+        if isinstance(self, Resource):
+            if not request:
+                # Ensure we have a response object.
+                request = self._request
+
         Serializer = None
         if format:
             # An explicit format was given; do not attempt to auto-detect
@@ -365,6 +427,10 @@ class Resource(object):
             Serializer = self.meta.serializers[format]
 
         if not Serializer:
+            if isinstance(self, Resource):
+                # The response is negotiated from the `Accept` header.
+                self.vary.add('Accept')
+
             # Determine an appropriate serializer to use by
             # introspecting the request object and looking at the `Accept`
             # header.
@@ -387,28 +453,7 @@ class Resource(object):
                 default = self.meta.default_serializer
                 Serializer = self.meta.serializers[default]
 
-        if Serializer:
-            try:
-                # Attempt to serialize the data using the determined
-                # serializer.
-                serializer = Serializer(request, response)
-                return serializer.serialize(data), serializer
-
-            except ValueError:
-                # Failed to serialize the data.
-                pass
-
-        # Either failed to determine a serializer or failed to serialize
-        # the data; construct a list of available and valid encoders.
-        available = {}
-        for name in self.meta.allowed_serializers:
-            Serializer = self.meta.serializers[name]
-            instance = Serializer(request, None)
-            if instance.can_serialize(data):
-                available[name] = Serializer.media_types[0]
-
-        # Raise a Not Acceptable exception.
-        raise http.exceptions.NotAcceptable(available)
+        return Serializer
 
     @classmethod
     def _process_cross_domain_request(cls, request, response):
@@ -472,11 +517,62 @@ class Resource(object):
         if exposed_headers:
             response['Access-Control-Expose-Headers'] = exposed_headers
 
+    @property
+    def http_cache(self):
+        """Retrieves the `Cache-Control` directives for this request."""
+        return self.meta.http_cache
+
+    def _process_cache_control(self, request, response):
+        """Describe how the response may be cached.
+        """
+        # The response varies by the user if it may be authenticated
+        # from a header and by the origin if it is shared across origins.
+        vary = set(self.vary)
+        if any(isinstance(x, authentication.HeaderAuthentication)
+               for x in self.meta.authentication):
+            vary.add('Authorization')
+
+        if self.meta.http_allowed_origins:
+            vary.add('Origin')
+
+        if self.meta.compression:
+            # The body may be compressed as negotiated.
+            vary.add('Accept-Encoding')
+
+        if vary:
+            response['Vary'] = ', '.join(sorted(vary))
+
+        # Only successful responses to reads are cached.
+        directives = self.http_cache
+        if (not directives or request.method not in ('GET', 'HEAD')
+                or response.status not in CACHEABLE_STATUSES):
+            return
+
+        control = []
+        if directives.get('public') is not None:
+            control.append('public' if directives['public'] else 'private')
+
+        for name in ('max_age', 's_maxage', 'stale_while_revalidate'):
+            if directives.get(name) is not None:
+                control.append('{}={}'.format(
+                    name.replace('_', '-'), directives[name]))
+
+        response['Cache-Control'] = ', '.join(control)
+
+        if directives.get('max_age') is not None:
+            # Give the expiry to HTTP/1.0 caches as well.
+            response['Expires'] = http.format_date(
+                time.time() + directives['max_age'])
+
     def __init__(self, request, response):
         # Store the request and response objects on self.
         self.request = request
         self.response = response
 
+        #! Names of the request headers that the response was negotiated
+        #! from; sent in the `Vary` header.
+        self.vary = set()
+
     def dispatch(self, request, response):
         """Entry-point of the dispatch cycle for this resource.
 
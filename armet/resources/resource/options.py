@@ -4,10 +4,24 @@ import re
 import six
 from importlib import import_module
 from armet import utils, authentication, authorization
+from armet.http import compression
 from armet.exceptions import ImproperlyConfigured
 from armet import connectors as included_connectors
 
 
+#! Directives that may be given in the `http_cache` options.
+CACHE_DIRECTIVES = ('max_age', 's_maxage', 'public', 'stale_while_revalidate')
+
+
+def check_cache(value, name):
+    """Ensures the passed `http_cache` option only names known directives."""
+    for key in value or ():
+        if key not in CACHE_DIRECTIVES:
+            raise ImproperlyConfigured(
+                'The cache directive, {}, of {} is not one of {}'.format(
+                    key, name, ', '.join(CACHE_DIRECTIVES)))
+
+
 def _merge(options, name, bases, default=None):
     """Merges a named option collection."""
     result = None
@@ -249,6 +263,70 @@ class ResourceOptions(object):
         if self.http_allowed_origins is None:
             self.http_allowed_origins = ()
 
+        #! Directives of the `Cache-Control` header sent with successful
+        #! responses to safe requests; None (the default) sends no
+        #! `Cache-Control`.
+        #!
+        #! The directives are given as a dictionary with any of the
+        #! following keys:
+        #!  - max_age: Number of seconds the response is fresh for; this
+        #!      also sends an `Expires` header (for HTTP/1.0 caches).
+        #!  - s_maxage: Number of seconds the response is fresh for in
+        #!      shared caches (eg. a CDN or reverse proxy).
+        #!  - public: True to allow shared caches to store the response
+        #!      (even if it is authenticated); False to only allow the
+        #!      cache of the client to.
+        #!  - stale_while_revalidate: Number of seconds a stale response
+        #!      may be served while it is revalidated in the background.
+        #!
+        #! @code
+        #! from armet import resources
+        #! class Resource(resources.Resource):
+        #!     class Meta:
+        #!         http_cache = {'max_age': 60, 'public': True}
+        #! @endcode
+        self.http_cache = meta.get('http_cache')
+        check_cache(self.http_cache, 'http_cache')
+
+        #! Content codings (`gzip` and `deflate`) that response bodies may
+        #! be compressed with, in order of preference; the coding is
+        #! negotiated from the `Accept-Encoding` header. True allows every
+        #! coding; defaults to sending bodies as they are.
+        #!
+        #! @code
+        #! from armet import resources
+        #! class Resource(resources.Resource):
+        #!     class Meta:
+        #!         compression = ('gzip',)
+        #!         compression_level = 9
+        #! @endcode
+        self.compression = meta.get('compression')
+        if self.compression is True:
+            self.compression = ('gzip', 'deflate')
+
+        elif isinstance(self.compression, six.string_types):
+            self.compression = self.compression,
+
+        self.compression = tuple(self.compression or ())
+        for coding in self.compression:
+            if coding not in compression.CODINGS:
+                raise ImproperlyConfigured(
+                    'The content coding, {}, of {} is not one of {}'.format(
+                        coding, self.name,
+                        ', '.join(sorted(compression.CODINGS))))
+
+        #! Minimum length (in bytes) of a body for it to be compressed;
+        #! smaller bodies aren't worth the effort. Streamed bodies are
+        #! compressed regardless as their length isn't known up front.
+        self.compression_threshold = meta.get('compression_threshold', 1024)
+
+        #! Level to compress bodies at; from 1 (fastest) to 9 (smallest).
+        self.compression_level = meta.get('compression_level', 6)
+        if not 1 <= self.compression_level <= 9:
+            raise ImproperlyConfigured(
+                'The compression level of {} must be from 1 to 9.'.format(
+                    self.name))
+
         #! Whether to use legacy redirects or not to inform the
         #! client the resource is available elsewhere. Legacy redirects
         #! require a combination of 301 and 307 in which 307 is not cacheable.
@@ -43,3 +43,16 @@ class Serializer(object):
         # Return the serialized data.
         # This has normally been transformed by a base class.
         return data
+
+    def stream(self, items):
+        """
+        Transforms the items of a list into an acceptable format for
+        transmission a piece at a time.
+
+        The default serializes the whole list at once; serializers of
+        formats that can be written incrementally should override this.
+
+        @returns
+            A generator of the text of the serialized list.
+        """
+        yield self.serialize(list(items))
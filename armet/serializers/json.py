@@ -31,3 +31,15 @@ class JSONSerializer(Serializer):
 
         # Return us to the base to enclose it inside of a response object.
         return super(JSONSerializer, self).serialize(text)
+
+    def stream(self, items):
+        # Open the array.
+        yield '['
+
+        # Serialize each item as it is given.
+        for index, item in enumerate(items):
+            text = json.dumps(item, ensure_ascii=False)
+            yield ',' + text if index else text
+
+        # Close the array.
+        yield ']'
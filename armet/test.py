@@ -96,6 +96,10 @@ class Client:
         kwargs.setdefault('method', 'DELETE')
         return self.request(*args, **kwargs)
 
+    def patch(self, *args, **kwargs):
+        kwargs.setdefault('method', 'PATCH')
+        return self.request(*args, **kwargs)
+
 
 class ResourceTestCase(unittest.TestCase):
 
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
 from .decorators import classproperty, boundmethod
-from .functional import cons, compose
+from .functional import cons, compose, differs
 from .string import dasherize
 from .package import import_module
+from .cache import LRUCache
 
 __all__ = [
     'classproperty',
     'boundmethod',
     'cons',
     'compose',
+    'differs',
     'import_module',
     'dasherize',
+    'LRUCache',
     'super'
 ]
 
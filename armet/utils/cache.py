@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals, division
+import threading
+import collections
+
+
+class LRUCache(object):
+    """Bounded mapping that discards the least recently used entries.
+
+    Keeps count of the lookups that were satisfied (`hits`) and those
+    that were not (`misses`) so that the effectiveness of the cache
+    can be observed.
+    """
+
+    def __init__(self, maxsize=128):
+        #! Maximum number of entries to retain.
+        self.maxsize = maxsize
+
+        #! Number of lookups that found an entry.
+        self.hits = 0
+
+        #! Number of lookups that did not find an entry.
+        self.misses = 0
+
+        #! Entries ordered from least to most recently used.
+        self._data = collections.OrderedDict()
+
+        #! Guards the entries as the cache is shared between requests.
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retrieves the entry stored at the passed key."""
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+
+            except KeyError:
+                # Not in the cache.
+                self.misses += 1
+                return default
+
+            # Re-insert the entry to mark it as most recently used.
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Stores the passed value at the passed key."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+
+            # Discard the least recently used entries until we fit.
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Removes the entry stored at the passed key, if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
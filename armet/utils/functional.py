@@ -38,3 +38,16 @@ def compose(*functions):
         return x
 
     return composed
+
+
+def differs(a, b):
+    """Determines if the passed values differ.
+
+    Values that can't be compared (eg. a naive and an aware datetime on
+    python 2) differ.
+    """
+    try:
+        return a != b
+
+    except TypeError:
+        return True
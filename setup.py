@@ -27,6 +27,10 @@ test_dependencies = [
     # HTTP request abstraction layer over httplib.
     'httplib2',
 
+    # Extensions to the standard datetime module; used by the temporal
+    # attributes of the test resources.
+    'python-dateutil',
+
     # The Web framework for perfectionists with deadlines.
     'django',
 
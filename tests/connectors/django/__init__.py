@@ -7,13 +7,29 @@ from wsgi_intercept.httplib2_intercept import install
 # Setup the environment variables.
 os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.connectors.django.settings'
 
-from .models import Poll
+from .models import Poll, Choice
 
 __all__ = [
-    'Poll'
+    'Poll',
+    'Choice',
+    'Replica',
+    'count_queries',
 ]
 
 
+class Replica(object):
+    """Options of resources that read from the replica."""
+
+    read_database = 'replica'
+
+
+def count_queries():
+    """Collects the statements executed within the block."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    return CaptureQueriesContext(connection)
+
+
 def http_setup(connectors, host, port, callback):
     # Setup the environment variables.
     os.environ['DJANGO_SETTINGS_MODULE'] = (
@@ -43,12 +59,15 @@ def model_setup():
     os.environ['DJANGO_SETTINGS_MODULE'] = (
         'tests.connectors.django.settings')
 
-    # Initialize the database and create all models.
-    from django.db import connections, DEFAULT_DB_ALIAS
-    connection = connections[DEFAULT_DB_ALIAS]
-    connection.creation.create_test_db(verbosity=0)
+    # Initialize the databases and create all models.
+    from django.db import connections
+    for alias in ('default', 'replica'):
+        connections[alias].creation.create_test_db(verbosity=0)
 
-    # Load the data fixture.
+    # Load the data fixture; nothing is replicated to the replica (it
+    # only holds the fixture).
     from django.core import management
     data = os.path.join(os.path.dirname(__file__), '..', 'data.json')
-    management.call_command('loaddata', data, verbosity=0, interactive=0)
+    for alias in ('default', 'replica'):
+        management.call_command(
+            'loaddata', data, verbosity=0, interactive=0, database=alias)
@@ -10,3 +10,14 @@ class Poll(models.Model):
     available = models.NullBooleanField()
 
     votes = models.IntegerField(null=True)
+
+    updated = models.DateTimeField(null=True)
+
+
+class Choice(models.Model):
+
+    poll = models.ForeignKey(Poll, related_name='choices')
+
+    text = models.CharField(max_length=1024)
+
+    votes = models.IntegerField(null=True)
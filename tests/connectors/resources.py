@@ -2,7 +2,7 @@
 from __future__ import absolute_import, unicode_literals, division
 import sys
 import armet
-from armet import resources, attributes, exceptions
+from armet import resources, attributes, exceptions, cache
 
 # Request the generic models module inserted by the test runner.
 models = sys.modules['tests.connectors.models']
@@ -37,6 +37,22 @@ __all__ = [
     'PollRequiredResource',
     'PollValidResource',
     'PollNamedResource',
+    'PollPagedResource',
+    'PollFieldsResource',
+    'PollStreamingResource',
+    'PollScopedResource',
+    'ChoiceResource',
+    'PollChoiceResource',
+    'PollReplicaResource',
+    'PollTaggedResource',
+    'PollVersionedResource',
+    'PollUntaggedResource',
+    'PollModifiedResource',
+    'ChoiceModifiedResource',
+    'PollCachedResource',
+    'PollCacheControlResource',
+    'PollCompressedResource',
+    'PollCompressedStreamingResource',
 ]
 
 
@@ -369,3 +385,120 @@ class PollValidResource(PollResource):
             raise exceptions.ValidationError(*errors)
 
         return value
+
+
+class PollPagedResource(PollResource):
+
+    class Meta:
+        max_page_size = 10
+
+        total_count = True
+
+
+class PollFieldsResource(PollResource):
+
+    class Meta:
+        fields = ('question',)
+
+
+class PollStreamingResource(PollResource):
+
+    class Meta:
+        streaming = True
+
+        chunk_size = 7
+
+
+class PollScopedResource(PollResource):
+
+    class Meta:
+        scoped_session = True
+
+
+class ChoiceResource(resources.ModelResource):
+
+    class Meta:
+        model = models.Choice
+
+        slug = 'id'
+
+    id = attributes.IntegerAttribute('id')
+
+    text = attributes.TextAttribute('text')
+
+    question = attributes.TextAttribute('poll.question')
+
+
+class PollChoiceResource(PollResource):
+
+    choice = attributes.TextAttribute('choices.text', include=False)
+
+
+class PollReplicaResource(PollResource):
+
+    class Meta(models.Replica):
+        pass
+
+
+class PollTaggedResource(PollResource):
+
+    class Meta:
+        etag = True
+
+
+class PollVersionedResource(PollResource):
+
+    class Meta:
+        etag_attribute = 'votes'
+
+    votes = attributes.IntegerAttribute('votes')
+
+
+class PollUntaggedResource(PollVersionedResource):
+
+    class Meta:
+        etag = False
+
+
+class PollModifiedResource(PollResource):
+
+    class Meta:
+        modified_attribute = 'updated'
+
+    updated = attributes.DateTimeAttribute('updated')
+
+
+class ChoiceModifiedResource(ChoiceResource):
+
+    class Meta:
+        modified_attribute = 'updated'
+
+    updated = attributes.DateTimeAttribute('poll.updated')
+
+
+class PollCachedResource(PollResource):
+
+    class Meta:
+        cache = cache.MemoryCache()
+
+        etag = True
+
+
+class PollCacheControlResource(PollResource):
+
+    class Meta:
+        http_cache = {'max_age': 60, 'public': True}
+
+        http_list_cache = {'max_age': 5, 's_maxage': 30}
+
+
+class PollCompressedResource(PollResource):
+
+    class Meta:
+        compression = True
+
+
+class PollCompressedStreamingResource(PollStreamingResource):
+
+    class Meta:
+        compression = ('gzip',)
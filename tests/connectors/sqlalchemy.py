@@ -2,6 +2,7 @@
 from __future__ import absolute_import, unicode_literals, division
 import os
 import json
+import contextlib
 import armet
 import sqlalchemy as sa
 from sqlalchemy import orm
@@ -16,6 +17,13 @@ engine = sa.create_engine('sqlite:///:memory:')
 # Construct the session factory.
 Session = orm.sessionmaker(bind=engine)
 
+# Instantiate the engine of the read replica; nothing is replicated
+# to it (it only holds the fixture).
+replica = sa.create_engine('sqlite:///:memory:')
+
+# Construct the session factory of the read replica.
+ReplicaSession = orm.sessionmaker(bind=replica)
+
 
 class Poll(Base):
 
@@ -29,8 +37,31 @@ class Poll(Base):
 
     votes = sa.Column(sa.Integer)
 
+    updated = sa.Column(sa.DateTime)
+
+
+class Choice(Base):
+
+    __tablename__ = 'choice'
+
+    id = sa.Column(sa.Integer, primary_key=True)
+
+    poll_id = sa.Column(sa.Integer, sa.ForeignKey('poll.id'))
+
+    poll = orm.relationship(Poll, backref='choices')
+
+    text = sa.Column(sa.String(1024))
+
+    votes = sa.Column(sa.Integer)
+
+
+class Replica(object):
+    """Options of resources that read from the replica."""
 
-def _load_fixture(filename):
+    ReadSession = ReplicaSession
+
+
+def _load_fixture(filename, Session=Session):
     """
     Loads the passed fixture into the database following the
     django format.
@@ -54,6 +85,11 @@ def _load_fixture(filename):
         # Add the primary key.
         item['fields']['id'] = item['pk']
 
+        # Foreign keys are named after the relationship in the fixture.
+        for name in list(item['fields']):
+            if name + '_id' in table.c:
+                item['fields'][name + '_id'] = item['fields'].pop(name)
+
         # Add a new row.
         session.connection().execute(table.insert().values(**item['fields']))
 
@@ -62,12 +98,31 @@ def _load_fixture(filename):
 
 
 def model_setup():
-    # Initialize the database and create all models.
-    Base.metadata.drop_all(engine)
-    Base.metadata.create_all(engine)
+    # Initialize the databases and create all models.
+    for bind in (engine, replica):
+        Base.metadata.drop_all(bind)
+        Base.metadata.create_all(bind)
 
     # Load the data fixture.
-    _load_fixture(os.path.join(os.path.dirname(__file__), 'data.json'))
+    filename = os.path.join(os.path.dirname(__file__), 'data.json')
+    _load_fixture(filename)
+    _load_fixture(filename, ReplicaSession)
 
     # Configure armet and provide the session factory.
     armet.use(Session=Session)
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Collects the statements executed within the block."""
+    queries = []
+
+    def collect(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    sa.event.listen(engine, 'before_cursor_execute', collect)
+    try:
+        yield queries
+
+    finally:
+        sa.event.remove(engine, 'before_cursor_execute', collect)
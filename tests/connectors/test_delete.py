@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
+import json
 from armet import http
 from .base import BaseResourceTest
 
@@ -12,3 +13,24 @@ class TestResourceDelete(BaseResourceTest):
             headers={'Content-Type': 'application/json'})
 
         assert response.status == http.client.NO_CONTENT
+
+    def test_delete_list(self, connectors):
+        response, _ = self.client.delete(path='/api/poll/?available=false')
+
+        assert response.status == http.client.NO_CONTENT
+
+        response, content = self.client.request(
+            '/api/poll:count/?available=false')
+        data = json.loads(content.decode('utf8'))
+
+        assert data['count'] == 0
+
+    def test_delete_list_unfiltered(self, connectors):
+        response, _ = self.client.delete(path='/api/poll/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+        response, content = self.client.request('/api/poll:count/')
+        data = json.loads(content.decode('utf8'))
+
+        assert data['count'] > 0
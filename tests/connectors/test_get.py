@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
 import json
+import zlib
+import httplib2
 from armet import http
 from .base import BaseResourceTest
 from pytest import mark
@@ -124,6 +126,778 @@ class TestResourceQuery(BaseResourceTest):
         assert isinstance(data, list)
         assert len(data) == 4
 
+    def test_param_group(self, connectors):
+        response, content = self.client.request(
+            '/api/poll/?(id=1;id=2;id=3)&available=true')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert sorted(x['id'] for x in data) == [1, 3]
+
+    def test_param_precedence(self, connectors):
+        response, content = self.client.request(
+            '/api/poll/?id=1;id=2&available=true')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert [x['id'] for x in data] == [1]
+
+    def test_param_negated_group(self, connectors):
+        response, content = self.client.request(
+            '/api/poll/?!(id>2)&!(available=false)')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert [x['id'] for x in data] == [1]
+
+    def test_param_contradiction(self, connectors):
+        response, content = self.client.request('/api/poll/?id>5&id<3')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert data == []
+
+    def test_param_bogus(self, connectors):
+        response, _ = self.client.request('/api/poll/?(id=1')
+
+        assert response.status == http.client.BAD_REQUEST
+
+    def test_param_in(self, connectors):
+        response, content = self.client.request('/api/poll/?id.in=1,2,3')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert sorted(x['id'] for x in data) == [1, 2, 3]
+
+    def test_param_in_many(self, connectors):
+        ids = ','.join(str(x) for x in range(0, 1000, 2))
+        response, content = self.client.request('/api/poll/?id={}'.format(ids))
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert len(data) == 50
+
+    def test_param_not_in(self, connectors):
+        response, content = self.client.request('/api/poll/?id!=1,2,3')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert len(data) == 97
+
+    def test_param_isnull(self, connectors):
+        response, content = self.client.request('/api/poll/?available.isnull')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert len(data) == 92
+
+    def test_param_isnull_false(self, connectors):
+        response, content = self.client.request(
+            '/api/poll/?available.isnull=false')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert len(data) == 8
+
+    def test_param_regex(self, connectors):
+        response, content = self.client.request(
+            '/api/poll/?question*=Have.*written')
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        assert len(data) == 3
+
+    def test_param_no_values(self, connectors):
+        response, _ = self.client.request('/api/poll/?id=')
+
+        assert response.status == http.client.BAD_REQUEST
+
+
+@mark.bench('self.client.request', iterations=1000)
+class TestResourceDirectives(BaseResourceTest):
+
+    def request(self, path):
+        response, content = self.client.request(path)
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, list)
+        return [x['id'] for x in data]
+
+    def test_limit(self, connectors):
+        assert self.request('/api/poll:limit=10/') == list(range(1, 11))
+
+    def test_offset(self, connectors):
+        assert self.request('/api/poll:offset=95/') == list(range(96, 101))
+
+    def test_offset_limit(self, connectors):
+        ids = self.request('/api/poll:offset=20:limit=5/')
+
+        assert ids == list(range(21, 26))
+
+    def test_sort(self, connectors):
+        ids = self.request('/api/poll:sort=question/')
+
+        assert len(ids) == 100
+        assert ids[:2] == [86, 1]
+
+    def test_sort_descending(self, connectors):
+        assert self.request('/api/poll:sort=-id:limit=3/') == [100, 99, 98]
+
+    def test_sort_several(self, connectors):
+        ids = self.request('/api/poll:sort=-available,id:limit=3/')
+
+        assert ids == [1, 3, 5]
+
+    def test_query(self, connectors):
+        ids = self.request('/api/poll:sort=-id:limit=2/?available=true')
+
+        assert ids == [7, 5]
+
+    def test_max_page_size(self, connectors):
+        assert self.request('/api/poll-paged/') == list(range(1, 11))
+
+    def test_max_page_size_limit(self, connectors):
+        assert self.request('/api/poll-paged:limit=50/') == list(range(1, 11))
+        assert self.request('/api/poll-paged:limit=5/') == list(range(1, 6))
+
+    def next_page(self, path):
+        response, content = self.client.request(path)
+        link = response.get('link')
+        if link is None:
+            return None
+
+        # Strip the scheme and authority from the link.
+        assert link.endswith('>; rel="next"')
+        prefix = '<http://{}:{}'.format(self.host, self.port)
+        assert link.startswith(prefix)
+        return link[len(prefix):-len('>; rel="next"')]
+
+    def test_cursor(self, connectors):
+        path = self.next_page('/api/poll:limit=10/')
+
+        assert self.request(path) == list(range(11, 21))
+
+        path = self.next_page(path)
+
+        assert self.request(path) == list(range(21, 31))
+
+    def test_cursor_sort(self, connectors):
+        path = self.next_page('/api/poll:sort=-id:limit=3/')
+
+        assert self.request(path) == [97, 96, 95]
+
+    def test_cursor_query(self, connectors):
+        path = self.next_page('/api/poll:limit=2/?available=true')
+
+        assert path.endswith('?available=true')
+        assert self.request(path) == [5, 7]
+
+        path = self.next_page(path)
+
+        assert self.request(path) == []
+        assert self.next_page(path) is None
+
+    def test_cursor_walk(self, connectors):
+        ids = []
+        path = '/api/poll-paged/'
+        while path is not None:
+            ids.extend(self.request(path))
+            path = self.next_page(path)
+
+        assert ids == list(range(1, 101))
+
+    def test_cursor_last_page(self, connectors):
+        assert self.next_page('/api/poll:offset=95:limit=10/') is None
+
+    def test_bogus_cursor(self, connectors):
+        response, _ = self.client.request('/api/poll:limit=2:cursor=zzz/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+    def test_bogus_limit(self, connectors):
+        response, _ = self.client.request('/api/poll:limit=ten/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+    def test_bogus_sort(self, connectors):
+        response, _ = self.client.request('/api/poll:sort=votes/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+
+@mark.bench('self.client.request', iterations=1000)
+class TestResourceFields(BaseResourceTest):
+
+    def request(self, path):
+        response, content = self.client.request(path)
+
+        assert response.status == http.client.OK
+
+        return json.loads(content.decode('utf-8'))
+
+    def test_item(self, connectors):
+        data = self.request('/api/poll:fields=question/1/')
+
+        assert data == {'question': 'Are you an innie or an outie?'}
+
+    def test_list(self, connectors):
+        data = self.request('/api/poll:fields=id,available:limit=2/')
+
+        assert data == [
+            {'id': 1, 'available': True},
+            {'id': 2, 'available': False},
+        ]
+
+    def test_default(self, connectors):
+        data = self.request('/api/poll-fields/1/')
+
+        assert data == {'question': 'Are you an innie or an outie?'}
+
+    def test_default_override(self, connectors):
+        assert self.request('/api/poll-fields:fields=id/1/') == {'id': 1}
+
+    def test_unknown(self, connectors):
+        response, _ = self.client.request('/api/poll:fields=votes/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+    def test_excluded(self, connectors):
+        response, _ = self.client.request('/api/poll-exclude:fields=question/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+
+@mark.bench('self.client.request', iterations=1000)
+class TestResourceCount(BaseResourceTest):
+
+    def count(self, path):
+        response, content = self.client.request(path)
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf-8'))
+
+        assert isinstance(data, dict)
+        return data['count']
+
+    def test_count(self, connectors):
+        assert self.count('/api/poll:count/') == 100
+
+    def test_count_query(self, connectors):
+        assert self.count('/api/poll:count/?available=true') == 4
+
+    def test_count_contradiction(self, connectors):
+        assert self.count('/api/poll:count/?id>5&id<3') == 0
+
+    def test_count_bounds(self, connectors):
+        assert self.count('/api/poll:count:limit=10/') == 100
+
+    def test_total_count(self, connectors):
+        response, content = self.client.request('/api/poll-paged/?id>50')
+
+        assert response.status == http.client.OK
+        assert response.get('x-total-count') == '50'
+        assert len(json.loads(content.decode('utf-8'))) == 10
+
+    def test_total_count_absent(self, connectors):
+        response, _ = self.client.request('/api/poll/')
+
+        assert response.status == http.client.OK
+        assert response.get('x-total-count') is None
+
+
+@mark.bench('self.client.request', iterations=1000)
+class TestResourceStreaming(BaseResourceTest):
+
+    def request(self, path):
+        response, content = self.client.request(path)
+
+        assert response.status == http.client.OK
+        assert response.get('content-type') == 'application/json'
+
+        return json.loads(content.decode('utf-8'))
+
+    def test_list(self, connectors):
+        data = self.request('/api/poll-streaming/')
+
+        assert data == self.request('/api/poll/')
+
+    def test_query(self, connectors):
+        data = self.request('/api/poll-streaming:sort=-id/?available=true')
+
+        assert [x['id'] for x in data] == [7, 5, 3, 1]
+
+    def test_empty(self, connectors):
+        assert self.request('/api/poll-streaming/?id>5&id<3') == []
+
+    def test_item(self, connectors):
+        data = self.request('/api/poll-streaming/1/')
+
+        assert data['question'] == 'Are you an innie or an outie?'
+
+    def test_queries(self, connectors):
+        # The list is read a chunk (of 7 items) at a time.
+        with self.models.count_queries() as queries:
+            data = self.request('/api/poll-streaming/')
+
+        assert len(data) == 100
+        assert len(queries) <= 100 // 7 + 1
+
+    def test_chunks_ordered(self, connectors):
+        # Ties (and nulls) of the sort key span the boundaries of the
+        # chunks.
+        for path in ('/api/poll-streaming:sort=available/',
+                     '/api/poll-streaming:sort=-available/'):
+            data = self.request(path)
+            keys = [x['available'] for x in data]
+            runs = [x for i, x in enumerate(keys) if not i or x != keys[i - 1]]
+
+            assert sorted(x['id'] for x in data) == list(range(1, 101))
+            assert len(runs) == len(set(runs))
+
+    def test_chunks_bounded(self, connectors):
+        data = self.request('/api/poll-streaming:sort=-id:offset=3:limit=20/')
+
+        assert [x['id'] for x in data] == list(range(97, 77, -1))
+
+
+@mark.bench('self.client.request', iterations=1000)
+class TestResourceScoped(BaseResourceTest):
+
+    def test_list(self, connectors):
+        response, content = self.client.request('/api/poll-scoped/')
+        data = json.loads(content.decode('utf-8'))
+
+        assert response.status == http.client.OK
+        assert len(data) == 100
+
+    def test_list_again(self, connectors):
+        # The session of the thread is reused by the next request.
+        for _ in range(2):
+            response, _ = self.client.request('/api/poll-scoped/?id=1,2')
+
+            assert response.status == http.client.OK
+
+
+@mark.bench('self.client.request', iterations=1000)
+class TestResourceRelated(BaseResourceTest):
+
+    def request(self, path):
+        response, content = self.client.request(path)
+
+        assert response.status == http.client.OK
+
+        return json.loads(content.decode('utf-8'))
+
+    def test_list(self, connectors):
+        data = self.request('/api/choice:sort=id/?id=1,2')
+
+        assert [x['text'] for x in data] == ['Innie', 'Outie']
+        assert set(x['question'] for x in data) == set([
+            'Are you an innie or an outie?'])
+
+    def test_item(self, connectors):
+        data = self.request('/api/choice/3/')
+
+        assert data['question'] == 'Have you ever written a song?'
+
+    def test_fields(self, connectors):
+        data = self.request('/api/choice:fields=question/3/')
+
+        assert data == {'question': 'Have you ever written a song?'}
+
+    def test_queries(self, connectors):
+        # The number of queries doesn't grow with the list.
+        with self.models.count_queries() as few:
+            self.request('/api/choice/?id=1,2')
+
+        with self.models.count_queries() as many:
+            self.request('/api/choice/')
+
+        assert len(few) == len(many)
+
+    def test_filter_related(self, connectors):
+        data = self.request(
+            '/api/choice:sort=id/?question.regex=^Have&question.regex=written')
+
+        assert [x['id'] for x in data] == [3, 4, 9, 10]
+
+    def test_sort_related(self, connectors):
+        data = self.request('/api/choice:sort=-question,id/?id<=4')
+
+        assert [x['id'] for x in data] == [3, 4, 1, 2]
+
+    def test_filter_sort_related(self, connectors):
+        data = self.request(
+            '/api/choice:sort=question,-id/?question.regex=written')
+
+        assert [x['id'] for x in data] == [10, 9, 4, 3]
+
+    def test_filter_many(self, connectors):
+        data = self.request('/api/poll-choice:sort=id/?choice=yes,no')
+
+        assert [x['id'] for x in data] == [2, 3, 4, 5, 6]
+
+    def test_filter_many_count(self, connectors):
+        data = self.request('/api/poll-choice:count/?choice=yes')
+
+        assert data['count'] == 5
+
+    def test_sort_many(self, connectors):
+        response, _ = self.client.request('/api/poll-choice:sort=choice/')
+
+        assert response.status == http.client.BAD_REQUEST
+
+
+class TestResourceReplica(BaseResourceTest):
+
+    def question(self, **kwargs):
+        response, content = self.client.request(
+            '/api/poll-replica/1/', **kwargs)
+
+        assert response.status == http.client.OK
+
+        return json.loads(content.decode('utf-8'))['question']
+
+    def test_read_replica(self, connectors):
+        # Write to the primary; the replica never hears of it.
+        response, _ = self.client.patch(
+            path='/api/poll-replica/1/', body={'question': 'Innie?'})
+
+        assert response.status == http.client.OK
+        assert self.question() == 'Are you an innie or an outie?'
+
+        # Pin the read to the primary.
+        headers = {'X-Read-Primary': '1'}
+
+        assert self.question(headers=headers) == 'Innie?'
+
+
+class TestResourceETag(BaseResourceTest):
+
+    def etag(self, path, **kwargs):
+        response, content = self.client.request(path, **kwargs)
+
+        assert response.status == http.client.OK
+
+        return response['etag']
+
+    def not_modified(self, path, etag):
+        headers = {'If-None-Match': etag}
+        response, content = self.client.request(path, headers=headers)
+
+        return response.status == http.client.NOT_MODIFIED and not content
+
+    def test_hash_item(self, connectors):
+        etag = self.etag('/api/poll-tagged/1/')
+
+        assert self.not_modified('/api/poll-tagged/1/', etag)
+        assert self.not_modified('/api/poll-tagged/1/', 'W/' + etag)
+
+    def test_hash_list(self, connectors):
+        etag = self.etag('/api/poll-tagged/')
+
+        assert self.not_modified('/api/poll-tagged/', etag)
+        assert not self.not_modified('/api/poll-tagged/', '"bogus"')
+
+    def test_attribute_item(self, connectors):
+        etag = self.etag('/api/poll-versioned/1/')
+
+        assert etag != self.etag('/api/poll-versioned/2/')
+        assert self.not_modified('/api/poll-versioned/1/', etag)
+        assert not self.not_modified('/api/poll-versioned/2/', etag)
+
+    def test_attribute_list(self, connectors):
+        etag = self.etag('/api/poll-versioned/')
+
+        assert etag != self.etag('/api/poll-versioned:fields=id/')
+        assert self.not_modified('/api/poll-versioned/', '"bogus", ' + etag)
+        assert self.not_modified('/api/poll-versioned/', '*')
+
+    def test_untagged(self, connectors):
+        response, _ = self.client.request('/api/poll/1/')
+
+        assert 'etag' not in response
+
+    def test_untagged_attribute(self, connectors):
+        response, _ = self.client.request('/api/poll-untagged/1/')
+
+        assert response.status == http.client.OK
+        assert 'etag' not in response
+
+
+class TestResourceModified(BaseResourceTest):
+
+    def modify(self):
+        response, _ = self.client.patch(
+            path='/api/poll-modified/90/',
+            body={'updated': '2013-05-01T12:00:00Z'})
+
+        assert response.status == http.client.OK
+
+    def request(self, path, since=None):
+        headers = {'If-Modified-Since': since} if since else {}
+        return self.client.request(path, headers=headers)
+
+    def test_item(self, connectors):
+        self.modify()
+
+        response, _ = self.request('/api/poll-modified/90/')
+
+        assert response.status == http.client.OK
+        assert response['last-modified'] == 'Wed, 01 May 2013 12:00:00 GMT'
+
+    def test_item_not_modified(self, connectors):
+        self.modify()
+
+        response, content = self.request(
+            '/api/poll-modified/90/', 'Wed, 01 May 2013 12:00:00 GMT')
+
+        assert response.status == http.client.NOT_MODIFIED
+        assert not content
+
+    def test_item_modified(self, connectors):
+        self.modify()
+
+        response, _ = self.request(
+            '/api/poll-modified/90/', 'Wed, 01 May 2013 11:59:59 GMT')
+
+        assert response.status == http.client.OK
+
+    def test_list_not_modified(self, connectors):
+        self.modify()
+
+        response, content = self.request(
+            '/api/poll-modified/?id=89;id=90',
+            'Wed, 01 May 2013 12:00:00 GMT')
+
+        assert response.status == http.client.NOT_MODIFIED
+        assert not content
+
+    def test_undated(self, connectors):
+        response, _ = self.request(
+            '/api/poll-modified/?id=1', 'Wed, 01 May 2013 12:00:00 GMT')
+
+        assert response.status == http.client.OK
+        assert 'last-modified' not in response
+
+    def test_related(self, connectors):
+        # The choices are dated by the poll they belong to.
+        response, _ = self.client.patch(
+            path='/api/poll-modified/3/',
+            body={'updated': '2013-04-01T12:00:00Z'})
+
+        assert response.status == http.client.OK
+
+        response, content = self.request(
+            '/api/choice-modified/?id=5;id=6',
+            'Mon, 01 Apr 2013 12:00:00 GMT')
+
+        assert response.status == http.client.NOT_MODIFIED
+        assert not content
+
+
+class TestResourceCache(BaseResourceTest):
+
+    def request(self, path, **kwargs):
+        response, content = self.client.request(path, **kwargs)
+
+        assert response.status == http.client.OK
+
+        return response, json.loads(content.decode('utf-8'))
+
+    def patch(self, path, question):
+        response, _ = self.client.patch(path=path, body={'question': question})
+
+        assert response.status == http.client.OK
+
+    def test_hit(self, connectors):
+        _, data = self.request('/api/poll-cached/2/')
+
+        with self.models.count_queries() as queries:
+            _, cached = self.request('/api/poll-cached/2/')
+
+        assert cached == data
+        assert len(queries) == 0
+
+    def test_query(self, connectors):
+        # Both read `id=1 | (id=2 & available=true)`.
+        _, data = self.request('/api/poll-cached/?id=1;id=2&available=true')
+
+        with self.models.count_queries() as queries:
+            _, cached = self.request(
+                '/api/poll-cached/?available=true&id=2;id=1')
+
+        assert cached == data
+        assert 1 in [x['id'] for x in data]
+        assert len(queries) == 0
+
+    def test_not_modified(self, connectors):
+        response, _ = self.request('/api/poll-cached/4/')
+
+        headers = {'If-None-Match': response['etag']}
+        response, content = self.client.request(
+            '/api/poll-cached/4/', headers=headers)
+
+        assert response.status == http.client.NOT_MODIFIED
+        assert not content
+
+    def test_invalidate(self, connectors):
+        self.request('/api/poll-cached/3/')
+        self.patch('/api/poll-cached/3/', 'Cached?')
+
+        _, data = self.request('/api/poll-cached/3/')
+
+        assert data['question'] == 'Cached?'
+
+    def test_invalidate_model(self, connectors):
+        self.request('/api/poll-cached/3/')
+        self.patch('/api/poll/3/', 'Cached elsewhere?')
+
+        _, data = self.request('/api/poll-cached/3/')
+
+        assert data['question'] == 'Cached elsewhere?'
+
+
+class TestResourceCacheControl(BaseResourceTest):
+
+    def test_item(self, connectors):
+        response, _ = self.client.request('/api/poll-cache-control/1/')
+
+        assert response.status == http.client.OK
+        assert response['cache-control'] == 'public, max-age=60'
+        assert 'expires' in response
+        assert response['vary'] == 'Accept'
+
+    def test_list(self, connectors):
+        response, _ = self.client.request('/api/poll-cache-control/')
+
+        assert response.status == http.client.OK
+        assert response['cache-control'] == 'max-age=5, s-maxage=30'
+
+    def test_not_found(self, connectors):
+        response, _ = self.client.request('/api/poll-cache-control/1000/')
+
+        assert response.status == http.client.NOT_FOUND
+        assert 'cache-control' not in response
+
+    def test_absent(self, connectors):
+        response, _ = self.client.request('/api/poll/1/')
+
+        assert response.status == http.client.OK
+        assert 'cache-control' not in response
+
+
+class TestResourceCompression(BaseResourceTest):
+
+    def request(self, path, encoding):
+        headers = {'Accept-Encoding': encoding}
+        response, content = self.client.request(path, headers=headers)
+
+        assert response.status == http.client.OK
+
+        # The body is decompressed by the client; the coding it was sent
+        # with is kept as `-content-encoding`.
+        coding = response.get('-content-encoding')
+        return coding, json.loads(content.decode('utf-8'))
+
+    def test_gzip(self, connectors):
+        coding, data = self.request('/api/poll-compressed/', 'gzip')
+
+        assert coding == 'gzip'
+        assert data == self.request('/api/poll/', 'identity')[1]
+
+    def request_raw(self, path, encoding, monkeypatch):
+        # Leave the body as it is sent; clients disagree on how `deflate`
+        # is wrapped (RFC 7230 names a zlib stream).
+        monkeypatch.setattr(
+            httplib2, '_decompressContent', lambda response, x: x)
+
+        headers = {'Accept-Encoding': encoding}
+        response, content = self.client.request(path, headers=headers)
+
+        assert response.status == http.client.OK
+
+        return response.get('content-encoding'), content
+
+    def test_deflate(self, connectors, monkeypatch):
+        coding, content = self.request_raw(
+            '/api/poll-compressed/', 'deflate', monkeypatch)
+
+        assert coding == 'deflate'
+
+        data = json.loads(zlib.decompress(content).decode('utf-8'))
+
+        assert data == self.request('/api/poll/', 'identity')[1]
+
+    def test_preference(self, connectors, monkeypatch):
+        coding, content = self.request_raw(
+            '/api/poll-compressed/', 'gzip;q=0.5, deflate', monkeypatch)
+
+        assert coding == 'deflate'
+        assert json.loads(zlib.decompress(content).decode('utf-8'))
+
+    def test_identity(self, connectors):
+        coding, data = self.request('/api/poll-compressed/', 'identity')
+
+        assert coding is None
+        assert len(data) == 100
+
+    def test_threshold(self, connectors):
+        coding, data = self.request('/api/poll-compressed/1/', 'gzip')
+
+        assert coding is None
+        assert data['question'] == 'Are you an innie or an outie?'
+
+    def test_vary(self, connectors):
+        response, _ = self.client.request('/api/poll-compressed/1/')
+
+        assert 'Accept-Encoding' in response['vary']
+
+    def test_streaming(self, connectors):
+        path = '/api/poll-compressed-streaming/'
+        coding, data = self.request(path, 'gzip, deflate')
+
+        assert coding == 'gzip'
+        assert data == self.request('/api/poll/', 'identity')[1]
+
+    def test_uncompressed(self, connectors):
+        coding, _ = self.request('/api/poll/', 'gzip')
+
+        assert coding is None
+
 
 @mark.bench('self.client.request', iterations=1000)
 class TestResourceTraversal(BaseResourceTest):
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals, division
+from armet import http
+from .base import BaseResourceTest
+
+
+class TestResourceHead(BaseResourceTest):
+
+    def test_head_item(self, connectors):
+        response, content = self.client.head(path='/api/poll/1/')
+
+        assert response.status == http.client.OK
+        assert response['content-type'] == 'application/json'
+        assert not content
+
+    def test_head_item_not_found(self, connectors):
+        response, _ = self.client.head(path='/api/poll/1000/')
+
+        assert response.status == http.client.NOT_FOUND
+
+    def test_head_item_queries(self, connectors):
+        # The item is counted rather than read.
+        with self.models.count_queries() as queries:
+            response, _ = self.client.head(path='/api/poll/1/')
+
+        assert response.status == http.client.OK
+        assert len(queries) == 1
+
+    def test_head_list_total_count(self, connectors):
+        response, content = self.client.head(
+            path='/api/poll-paged/?id=1;id=2;id=3')
+
+        assert response.status == http.client.OK
+        assert response['x-total-count'] == '3'
+        assert not content
+
+    def test_head_etag(self, connectors):
+        response, _ = self.client.get(path='/api/poll-versioned/1/')
+        etag = response['etag']
+
+        response, _ = self.client.head(path='/api/poll-versioned/1/')
+
+        assert response.status == http.client.OK
+        assert response['etag'] == etag
+
+        headers = {'If-None-Match': etag}
+        response, _ = self.client.head(
+            path='/api/poll-versioned/1/', headers=headers)
+
+        assert response.status == http.client.NOT_MODIFIED
+
+    def test_head_attribute(self, connectors):
+        response, _ = self.client.head(path='/api/poll/1/question/')
+
+        assert response.status == http.client.OK
+
+    def test_head_attribute_not_found(self, connectors):
+        response, _ = self.client.head(path='/api/poll/1/blah/')
+
+        assert response.status == http.client.NOT_FOUND
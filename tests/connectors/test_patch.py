@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals, division
+import json
+from armet import http
+from .base import BaseResourceTest
+
+
+class TestResourcePatch(BaseResourceTest):
+
+    def count(self, path):
+        response, content = self.client.request(path)
+        return json.loads(content.decode('utf8'))['count']
+
+    def test_patch_list(self, connectors):
+        response, _ = self.client.patch(
+            path='/api/poll/?available=false', body={'available': True})
+
+        assert response.status == http.client.NO_CONTENT
+        assert self.count('/api/poll:count/?available=true') == 8
+        assert self.count('/api/poll:count/?available=false') == 0
+
+    def test_patch_list_array(self, connectors):
+        response, _ = self.client.patch(
+            path='/api/poll/', body=[{'available': True}])
+
+        assert response.status == http.client.BAD_REQUEST
+
+    def test_patch_list_unfiltered(self, connectors):
+        response, _ = self.client.patch(
+            path='/api/poll/', body={'available': False})
+
+        assert response.status == http.client.BAD_REQUEST
+        assert self.count('/api/poll:count/?available=false') < 100
+
+    def test_patch_item(self, connectors):
+        response, content = self.client.patch(
+            path='/api/poll/1/', body={'question': 'Innie?'})
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf8'))
+
+        assert data['question'] == 'Innie?'
+        assert data['available'] is True
+
+    def test_patch_item_unchanged(self, connectors):
+        response, content = self.client.patch(
+            path='/api/poll/3/', body={'available': True})
+
+        assert response.status == http.client.OK
+
+        data = json.loads(content.decode('utf8'))
+
+        assert data['question'] == (
+            'Can you make change for a dollar right now?')
+
+    def test_patch_item_missing(self, connectors):
+        response, _ = self.client.patch(
+            path='/api/poll/1000/', body={'question': 'Anybody?'})
+
+        assert response.status == http.client.NOT_FOUND
+
+    def test_patch_item_datetime(self, connectors):
+        # The stored value is compared with the (aware) value of the body;
+        # patching it again compares against a stored value.
+        for _ in range(2):
+            response, content = self.client.patch(
+                path='/api/poll-modified/80/',
+                body={'updated': '2013-06-01T08:30:00Z'})
+
+            assert response.status == http.client.OK
+
+            data = json.loads(content.decode('utf8'))
+
+            assert data['updated'].startswith('2013-06-01T08:30:00')
@@ -22,6 +22,30 @@ class TestResourcePost(BaseResourceTest):
         assert data['question'] == 'Is anybody really out there?'
         assert data['id'] == 101
 
+    def test_post_many(self, connectors):
+        data = [
+            {'question': 'Is anybody really out there?', 'available': False},
+            {'question': 'Is there anybody in there?', 'available': False}]
+
+        body = json.dumps(data)
+        response, content = self.client.post(
+            path='/api/poll/', body=body,
+            headers={'Content-Type': 'application/json'})
+
+        assert response.status == http.client.CREATED
+
+        data = json.loads(content.decode('utf8'))
+
+        assert isinstance(data, list)
+        assert [x['question'] for x in data] == [
+            'Is anybody really out there?', 'Is there anybody in there?']
+
+        response, content = self.client.request(
+            '/api/poll:count/?available=false')
+        data = json.loads(content.decode('utf8'))
+
+        assert data['count'] == 6
+
 
 class TestResourceEcho(BaseResourceTest):
 
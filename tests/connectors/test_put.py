@@ -21,3 +21,17 @@ class TestResourcePut(BaseResourceTest):
         assert isinstance(data, dict)
         assert data['question'] == 'Is anybody really out there?'
         assert data['id'] == 1
+
+    def test_put_scoped(self, connectors):
+        data = {'id': 1, 'question': 'Is anybody really out there?'}
+        body = json.dumps(data)
+        response, _ = self.client.put(
+            path='/api/poll-scoped/1/', body=body,
+            headers={'Content-Type': 'application/json'})
+
+        assert response.status == http.client.OK
+
+        response, content = self.client.request('/api/poll/1/')
+        data = json.loads(content.decode('utf8'))
+
+        assert data['question'] == 'Is anybody really out there?'
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Character-by-character implementation of the query parser that predates
+the tokenizer in `armet.query.lexer`.
+
+Kept as a reference to verify that the tokenizer-based parser recognizes
+the same grammar and as a baseline to benchmark it against.
+"""
+from __future__ import absolute_import, unicode_literals, division
+from six.moves import cStringIO as StringIO
+from itertools import chain
+from armet.query import constants
+from armet.query.parser import (
+    Query, QuerySegment, COMBINATORS, OPERATOR_SYMBOL_MAP, OPERATOR_KEYWORDS)
+
+
+#! Set of characters that begin an operator.
+OPERATOR_BEGIN_CHARS = set(x[0] for _, x in constants.OPERATORS if x)
+OPERATOR_BEGIN_CHARS.add(constants.NEGATION[1])
+
+
+def parse(text):
+    # Initialize the list of query segments.
+    segments = []
+
+    # Iterate through the characters in the query string; one-by-one
+    # in order to perform one-pass parsing.
+    stream = StringIO()
+
+    for character in text:
+
+        # We want to stop reading the query and pass it off to someone
+        # when we reach a logical or grouping operator.
+        if character in (constants.LOGICAL_AND, constants.LOGICAL_OR):
+
+            if not stream.tell():
+                # There is no content in the stream; a logical operator
+                # was found out of place.
+                raise ValueError('Found `{}` out of place'.format(
+                    character))
+
+            # Parse the segment up till the combinator
+            segment = parse_segment(stream.getvalue(), character)
+            segments.append(segment)
+            stream.truncate(0)
+            stream.seek(0)
+
+        else:
+            # This isn't a special character, just roll with it.
+            stream.write(character)
+
+    # TODO: Throw some nonsense here if the query string ended with a
+    # & or ;, because that makes no sense.
+
+    if stream.tell():
+        # Append the remainder of the query string.
+        segments.append(parse_segment(stream.getvalue()))
+
+    # Return the constructed query object.
+    return Query(segments)
+
+
+def _parse_operator(iterator):
+    """Parses the operator (eg. '==' or '<').
+
+    @returns
+        A tuple of the operator, whether it was negated, and the
+        remaining characters.
+    """
+    negated = False
+    stream = StringIO()
+    for character in iterator:
+        if character == constants.NEGATION[1]:
+            if stream.tell():
+                # Negation can only occur at the start of an operator.
+                raise ValueError('Unexpected negation.')
+
+            # We've been negated.
+            negated = not negated
+            continue
+
+        if (stream.getvalue() + character not in OPERATOR_SYMBOL_MAP and
+                stream.getvalue() + character not in OPERATOR_BEGIN_CHARS):
+            # We're no longer an operator.
+            break
+
+        # Expand the operator
+        stream.write(character)
+
+    # Check for existance.
+    text = stream.getvalue()
+    if text not in OPERATOR_SYMBOL_MAP:
+        # Doesn't exist because of a mis-placed negation in the middle
+        # of the path.
+        raise ValueError('Unexpected negation.')
+
+    # Return the found operator and the remaining characters.
+    return OPERATOR_SYMBOL_MAP[text], negated, chain(character, iterator)
+
+
+def parse_segment(text, combinator=constants.LOGICAL_AND):
+    # Initialize the properties of the query segment.
+    path = []
+    op = constants.OPERATOR_IEQUAL[0]
+    negated = False
+
+    # Construct an iterator over the segment text.
+    iterator = iter(text)
+    stream = StringIO()
+
+    # Iterate through the characters in the segment; one-by-one
+    # in order to perform one-pass parsing.
+    for character in iterator:
+
+        if (character == constants.NEGATION[1]
+                and not stream.tell() and not path):
+            # We've been negated.
+            negated = not negated
+            continue
+
+        if character in OPERATOR_BEGIN_CHARS:
+            # Found an operator; pull out what we can.
+            op, inverted, iterator = _parse_operator(
+                chain(character, iterator))
+
+            if inverted:
+                negated = not negated
+
+            # We're done here; go to the value parser
+            break
+
+        if character == constants.SEP_PATH:
+            # A path separator, push the current stack into the path
+            path.append(stream.getvalue())
+            stream.truncate(0)
+            stream.seek(0)
+
+            # Keep checking for more path segments.
+            continue
+
+        # Append the text to the stream
+        stream.write(character)
+
+    # Write any remaining information into the path.
+    path.append(stream.getvalue())
+
+    # Attempt to normalize the path.
+    try:
+        # The keyword 'not' can be the last item which
+        # negates this query.
+        if path[-1] == constants.NEGATION[0]:
+            negated = not negated
+            path.pop(-1)
+
+        # The last keyword can explicitly state the operation; in which
+        # case the operator symbol **must** be `=`.
+        if path[-1] in OPERATOR_KEYWORDS:
+            if op != constants.OPERATOR_IEQUAL[0]:
+                raise ValueError(
+                    'Explicit operations must use the `=` symbol.')
+
+            op = path.pop(-1)
+
+        # Make sure we still have a path left.
+        if not path:
+            raise IndexError()
+
+    except IndexError:
+        # Ran out of path items after removing operations and negation.
+        raise ValueError('No path specified in {}'.format(text))
+
+    # Values are not complicated (yet) so just slice and dice
+    # until we get a list of possible values.
+    values = ''.join(iterator)
+    values = values.split(constants.SEP_VALUE) if values else ()
+
+    # Return the constructed query segment.
+    return QuerySegment(
+        path=path,
+        operator=op,
+        negated=negated,
+        values=values,
+        combinator=COMBINATORS[combinator])
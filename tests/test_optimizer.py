@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals, division
+import operator
+import unittest
+from armet.query import parser, optimizer, QueryGroup
+
+
+class OptimizerTestCase(unittest.TestCase):
+
+    def optimize(self, text):
+        """Parse and optimize the text; values are cleaned as integers."""
+        def clean(node):
+            if isinstance(node, QueryGroup):
+                return node._replace(children=tuple(map(clean, node.children)))
+
+            return node._replace(values=tuple(map(int, node.values)))
+
+        return optimizer.optimize(clean(parser.parse(text).expression))
+
+    def test_merge_or(self):
+        item = self.optimize('x=1;x=2;x=1')
+
+        assert item.path == ('x',)
+        assert item.values == (1, 2)
+
+    def test_merge_negated_and(self):
+        item = self.optimize('x!=1&x!=2')
+
+        assert item.negated
+        assert item.values == (1, 2)
+
+    def test_no_merge_and(self):
+        item = self.optimize('x=1;y=2')
+
+        assert item.combinator == operator.or_
+        assert len(item.children) == 2
+
+    def test_duplicates(self):
+        item = self.optimize('x>1&y=2&x>1')
+
+        assert item.combinator == operator.and_
+        assert len(item.children) == 2
+
+    def test_duplicate_groups(self):
+        item = self.optimize('(a=1;b=1)&(b=1;a=1)')
+
+        assert item.combinator == operator.or_
+        assert len(item.children) == 2
+
+    def test_flatten(self):
+        item = self.optimize('(a=1&(b=2&c=3))&d=4')
+
+        assert item.combinator == operator.and_
+        assert [x.path for x in item.children] == [
+            ('a',), ('b',), ('c',), ('d',)]
+
+    def test_contradiction(self):
+        queries = [
+            'x>5&x<3',
+            'x>3&x<=3',
+            'x>=4&x<4',
+            'x=1&x=2',
+            'x=1,2&x>5',
+            'x.in=1,2&x=3',
+        ]
+        for query in queries:
+            assert self.optimize(query) == optimizer.NOTHING, query
+
+    def test_satisfiable(self):
+        queries = [
+            'x>3&x<5',
+            'x>=3&x<=3',
+            'x=1,2&x>1',
+            'x>5&y<3',
+            'x!=1&x=1,2',
+        ]
+        for query in queries:
+            assert self.optimize(query) != optimizer.NOTHING, query
+
+    def test_contradiction_absorbed(self):
+        item = self.optimize('(x>5&x<3);y=1')
+
+        assert item.path == ('y',)
+
+    def test_contradiction_propagated(self):
+        assert self.optimize('(x>5&x<3)&y=1') == optimizer.NOTHING
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals, division
 import unittest
+import operator
 from armet.query import parser, constants
 from pytest import mark
 
@@ -21,16 +22,16 @@ class QueryTestCase(unittest.TestCase):
     def test_simple_filter(self):
         item = self.parse('foo=bar').segments[0]
 
-        assert item.path == ['foo']
+        assert item.path == ('foo',)
         assert item.operator, constants.OPERATOR_IEQUAL[0]
         assert not item.negated
-        assert item.values == ['bar']
+        assert item.values == ('bar',)
 
     def test_binary(self):
         item = self.parse(b'foo=bar').segments[0]
 
-        assert item.path == ['foo']
-        assert item.values == ['bar']
+        assert item.path == ('foo',)
+        assert item.values == ('bar',)
 
     def test_negation(self):
         queries = ['foo!=bar', 'foo.not=bar']
@@ -42,18 +43,18 @@ class QueryTestCase(unittest.TestCase):
     def test_relational_filter(self):
         item = self.parse('bread.sticks=delicious').segments[0]
 
-        assert item.path == ['bread', 'sticks']
+        assert item.path == ('bread', 'sticks')
         assert item.operator, constants.OPERATOR_IEQUAL[0]
         assert not item.negated
-        assert item.values == ['delicious']
+        assert item.values == ('delicious',)
 
     def test_values(self):
         item = self.parse('fruit=apples,oranges').segments[0]
 
-        assert item.path == ['fruit']
+        assert item.path == ('fruit',)
         assert item.operator, constants.OPERATOR_IEQUAL[0]
         assert not item.negated
-        assert item.values == ['apples', 'oranges']
+        assert item.values == ('apples', 'oranges')
 
     def test_bogus(self):
         """Test some bogusy query strings."""
@@ -71,18 +72,18 @@ class QueryTestCase(unittest.TestCase):
         for name, symbol in constants.OPERATORS:
             item = self.parse('crazy.{}=true'.format(name)).segments[0]
 
-            assert item.path == ['crazy']
+            assert item.path == ('crazy',)
             assert item.operator == name
             assert not item.negated
-            assert item.values == ['true']
+            assert item.values == ('true',)
 
             if symbol is not None:
                 item = self.parse('crazy{}true'.format(symbol)).segments[0]
 
-                assert item.path == ['crazy']
+                assert item.path == ('crazy',)
                 assert item.operator == name
                 assert not item.negated
-                assert item.values == ['true']
+                assert item.values == ('true',)
 
     def test_fusion(self):
         """Test something from everything combined"""
@@ -92,7 +93,115 @@ class QueryTestCase(unittest.TestCase):
         # Don't care about the other ones, as they're testing the &
         item = self.parse(q).segments[1]
 
-        assert item.path == ['guns', 'n', 'roses']
+        assert item.path == ('guns', 'n', 'roses')
         assert item.operator == constants.OPERATOR_IEQUAL[0]
         assert item.negated
-        assert item.values == ['paradise', 'city']
+        assert item.values == ('paradise', 'city')
+
+    def test_immutable(self):
+        query = self.parse('foo=bar')
+        item = query.segments[0]
+
+        self.assertRaises(AttributeError, setattr, query, 'segments', ())
+        self.assertRaises(AttributeError, setattr, item, 'path', ('baz',))
+
+    def test_hashable(self):
+        lhs = parser._parse('foo=bar&baz>2')
+        rhs = parser._parse('foo=bar&baz>2')
+
+        assert lhs is not rhs
+        assert lhs == rhs
+        assert hash(lhs) == hash(rhs)
+        assert lhs != parser._parse('foo=bar;baz>2')
+
+
+class QueryCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        parser.cache.clear()
+
+    def test_hit(self):
+        query = parser.parse('foo=bar')
+
+        assert parser.cache.misses == 1
+        assert parser.cache.hits == 0
+
+        assert parser.parse('foo=bar') is query
+        assert parser.parse(b'foo=bar') is query
+
+        assert parser.cache.misses == 1
+        assert parser.cache.hits == 2
+
+    def test_bounded(self):
+        maxsize = parser.cache.maxsize
+        for index in range(maxsize + 10):
+            parser.parse('foo={}'.format(index))
+
+        assert len(parser.cache) == maxsize
+        assert 'foo=0' not in parser.cache
+        assert 'foo={}'.format(maxsize + 9) in parser.cache
+
+    def test_error_not_cached(self):
+        self.assertRaises(ValueError, parser.parse, 'lte=3')
+
+        assert 'lte=3' not in parser.cache
+
+
+class QueryGroupTestCase(unittest.TestCase):
+
+    def parse(self, text):
+        return parser.parse(text).expression
+
+    def test_single(self):
+        item = self.parse('foo=bar')
+
+        assert isinstance(item, parser.QuerySegment)
+        assert item.path == ('foo',)
+
+    def test_precedence(self):
+        item = self.parse('a=1;b=2&c=3')
+
+        assert item.combinator == operator.or_
+        assert item.children[0].path == ('a',)
+        assert item.children[1].combinator == operator.and_
+        assert [x.path for x in item.children[1].children] == [
+            ('b',), ('c',)]
+
+    def test_group(self):
+        item = self.parse('(a=1;b=2)&c=3')
+
+        assert item.combinator == operator.and_
+        assert item.children[0].combinator == operator.or_
+        assert [x.path for x in item.children[0].children] == [
+            ('a',), ('b',)]
+        assert item.children[1].path == ('c',)
+
+    def test_nested_group(self):
+        item = self.parse('((a=1))')
+
+        assert isinstance(item, parser.QuerySegment)
+        assert item.path == ('a',)
+
+    def test_negated_group(self):
+        item = self.parse('!(a=1;b=2)')
+
+        assert item.combinator == operator.and_
+        assert all(x.negated for x in item.children)
+
+    def test_segments(self):
+        query = parser.parse('(a=1;b=2)&(c=3;d=4)')
+
+        assert [x.path for x in query.segments] == [
+            ('a',), ('b',), ('c',), ('d',)]
+
+    def test_bogus(self):
+        queries = [
+            '(a=1',
+            'a=1)',
+            '()',
+            '(&a=1)',
+            'a(b)=1',
+            '(a=1)b=2',
+        ]
+        for query in queries:
+            self.assertRaises(ValueError, parser.parse, query)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals, division
+import unittest
+from armet.query import parser, lexer
+from pytest import mark
+from . import query_reference
+
+
+#! Query strings that exercise the grammar.
+QUERIES = [
+    'foo',
+    'foo=bar',
+    'foo==bar',
+    'foo===bar',
+    'foo!=bar',
+    'foo!!=bar',
+    '!foo=bar',
+    '!!foo=bar',
+    '!=bar',
+    'foo.not=bar',
+    'foo.lte=3',
+    'foo.not.lte=3',
+    'foo.lte.not=3',
+    'foo<3',
+    'foo<=3',
+    'foo<==3',
+    'foo=<3',
+    'foo>3',
+    'foo>=3',
+    'foo*=^ba.*r$',
+    'foo=b.a=r<z!',
+    'foo=,,bar,',
+    'foo..bar=3',
+    'foo.=3',
+    '.foo=3',
+    'bread.sticks=delicious',
+    'fruit=apples,oranges',
+    'id=1&id=2',
+    'id=1;id=2',
+    'id=1&',
+    'queen:asc',
+    ('the.rolling.stones.iregex.not:asc=sympathy,for,the,devil&'
+     '!guns.n.roses=paradise,city&queen:asc'),
+]
+
+#! Query strings that are not part of the grammar.
+BOGUS = [
+    '&foo=bar',
+    'foo=bar&&baz=3',
+    'foo:asc&;bar:desc',
+    'foo.lte<=3',
+    'foo.!negate',
+    'foo.negate=!3',
+    'foo!bar=3',
+    'foo!',
+    'foo*bar',
+    'foo**=bar',
+    'lte=3',
+    'not',
+]
+
+
+class LexerTestCase(unittest.TestCase):
+
+    def test_tokens(self):
+        tokens = list(lexer.tokenize('!foo.bar<=3,4;baz'))
+
+        assert tokens == [
+            (lexer.NEGATION, '!'),
+            (lexer.NAME, 'foo'),
+            (lexer.SEPARATOR, '.'),
+            (lexer.NAME, 'bar'),
+            (lexer.OPERATOR, '<='),
+            (lexer.VALUES, '3,4'),
+            (lexer.COMBINATOR, ';'),
+            (lexer.NAME, 'baz'),
+        ]
+
+    def test_values_are_opaque(self):
+        tokens = list(lexer.tokenize('foo=a.b!=c<d'))
+
+        assert tokens[-1] == (lexer.VALUES, 'a.b!=c<d')
+
+    def test_empty_values(self):
+        assert parser.parse('foo=').segments[0].values == ()
+
+    def test_equivalence(self):
+        for text in QUERIES:
+            assert parser._parse(text) == query_reference.parse(text), text
+
+    def test_equivalence_bogus(self):
+        for text in BOGUS:
+            self.assertRaises(ValueError, query_reference.parse, text)
+            self.assertRaises(ValueError, parser._parse, text)
+
+    def test_long_values(self):
+        values = tuple(str(x) for x in range(10000))
+        item = parser._parse('id={}'.format(','.join(values))).segments[0]
+
+        assert item.path == ('id',)
+        assert item.values == values
+
+
+#! Inputs used to compare the throughput of the parsers.
+SHORT = 'foo.bar!=3,4;baz>2'
+LONG = '&'.join('attribute{0}.nested<={0},{0}'.format(x) for x in range(50))
+PATHOLOGICAL = 'id={}'.format(','.join(str(x) for x in range(5000)))
+
+
+class BaseParserBenchmark(object):
+
+    def test_short(self):
+        self.parse(SHORT)
+
+    def test_long(self):
+        self.parse(LONG)
+
+    def test_pathological(self):
+        self.parse(PATHOLOGICAL)
+
+
+@mark.bench('parser._parse', iterations=100)
+class TestParserBenchmark(BaseParserBenchmark):
+
+    def parse(self, text):
+        return parser._parse(text)
+
+
+@mark.bench('query_reference.parse', iterations=100)
+class TestReferenceParserBenchmark(BaseParserBenchmark):
+
+    def parse(self, text):
+        return query_reference.parse(text)
@@ -56,6 +56,14 @@ class TestJSONSerializer(TestSerializer):
 
         assert self.content == '[1,2,3]'
 
+    def test_stream(self):
+        content = ''.join(self.serializer.stream(iter([1, {'x': 2}, 3])))
+
+        assert content == '[1,{"x":2},3]'
+
+    def test_stream_empty(self):
+        assert ''.join(self.serializer.stream(iter([]))) == '[]'
+
     def test_array_nested(self):
         self.serialize([1, [2, 4, 5], 3])
 